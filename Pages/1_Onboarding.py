@@ -2,67 +2,60 @@ import streamlit as st
 
 st.set_page_config(layout="wide")
 
-import json
-import pandas as pd
+from catalogs import available_frameworks
+from metrics import start_rerun
+from org_session import current_catalog, current_framework, persist_completed, select_framework, sync_organization
+
+rerun = start_rerun("Onboarding")
 
 # ------------------ Load Data ------------------ #
-@st.cache_data
-def load_roadmap():
-    with open("roadmap_data.json", "r") as f:
-        return json.load(f)
+sync_organization()
+rerun.phase("data_load")
 
-@st.cache_data
-def load_tier_descriptions():
-    return pd.read_csv("SOC 2 to NIST Privacy Framework - Milestone Descriptions.csv")
+st.title("Onboarding: Answer Questions to Assess Your Privacy Tier")
 
-roadmap = load_roadmap()
-tier_df = load_tier_descriptions()
+frameworks = available_frameworks()
+framework = st.selectbox(
+    "Framework",
+    options=frameworks,
+    index=frameworks.index(current_framework()),
+    help="The certification or regulation your roadmap is mapped to. Changing it starts your progress over.",
+)
+select_framework(framework)
 
-st.title("Onboarding: Answer Questions to Assess Your Privacy Tier")
+# Form layout and cumulative task masks are built once per catalog, not per rerun
+catalog = current_catalog()
+roadmap_index = catalog.index
+
+rerun.phase("widget_render")
 st.markdown("### For each category, select the **highest tier** you've completed. All lower tiers will be included.")
 
 selected_tiers = {}
-completed_ids = []
 
 with st.form("tier_selection_form"):
-    for _, row in tier_df.iterrows():
-        category = row["Task Category"]
-
-        # Identify available tiers
-        available_tiers = {
-            tier: str(row.get(f"Tier {tier}", "")).strip()
-            for tier in range(1, 5)
-            if pd.notna(row.get(f"Tier {tier}")) and str(row.get(f"Tier {tier}")).strip() != "-"
-        }
-
-        if not available_tiers:
-            continue
-
-        st.markdown(f"---\n### {category}")
-        for tier, desc in available_tiers.items():
-            st.markdown(f"**Tier {tier}:** {desc}")
-
-        # Build choices: always allow "0: Not started"
-        tier_choices = [0] + sorted(available_tiers.keys())
-        tier_labels = {0: "0: Not started", **{t: f"{t}: Tier {t}" for t in available_tiers}}
-
-        selected = st.selectbox(
+    for entry in catalog.onboarding:
+        st.markdown(entry.markdown)
+        # Choices always include "0: Not started"
+        selected_tiers[entry.category] = st.selectbox(
             "Select highest tier completed:",
-            options=tier_choices,
-            format_func=lambda x: tier_labels[x],
-            key=f"select_{category}"
+            options=entry.choices,
+            format_func=entry.labels.__getitem__,
+            key=f"select_{entry.category}"
         )
 
-        selected_tiers[category] = selected
-
     submitted = st.form_submit_button("🎯 Generate My Profile")
 
 # ------------------ Submission Logic ------------------ #
 if submitted:
+    rerun.phase("submit")
+    # One OR of a precomputed cumulative mask per category
+    completed_mask = 0
     for category, selected_tier in selected_tiers.items():
-        for task in roadmap:
-            if task["category"] == category and int(task["tier"]) <= selected_tier:
-                completed_ids.append(task["id"])
+        completed_mask |= roadmap_index.mask_up_to_tier(category, selected_tier)
 
-    st.session_state["completed_tasks"] = list(set(completed_ids))
+    st.session_state["completed_mask"] = completed_mask
+    st.session_state.pop("progress_tracker", None)
+    persist_completed(roadmap_index.mask_to_ids(completed_mask), replace=True)
     st.success("✅ Profile generated! You can now continue to Tier Profile.")
+
+rerun.finish()
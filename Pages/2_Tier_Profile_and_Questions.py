@@ -1,93 +1,29 @@
 import streamlit as st
-import json
+from metrics import start_rerun
+from org_session import current_catalog, persist_questions, sync_organization
+from report_templates import TIER_DEFINITIONS
+from simulator import ANSWER_COMBINATIONS, answers_of, simulate, target_profiles
 
 st.set_page_config(layout="wide")
+rerun = start_rerun("Tier Profile and Questions")
 
 # ----------- Load Data ----------- #
-@st.cache_data
-def load_roadmap():
-    with open("roadmap_data.json") as f:
-        return json.load(f)
-
-roadmap = load_roadmap()
+sync_organization()
+rerun.phase("data_load")
+catalog = current_catalog()
+roadmap_index = catalog.index
 
 st.title("Tier Profile and Roadmap Setup")
 
 # ----------- Check Onboarding Completion ----------- #
-if "completed_tasks" not in st.session_state:
+if "completed_mask" not in st.session_state:
     st.warning("⚠️ Please complete the onboarding first.")
-    st.stop()
-
-completed_ids = set(st.session_state["completed_tasks"])
-
-# ----------- Full NIST Tier Definitions ----------- #
-tier_definitions = {
-    1: """
-### Tier 1: Partial
-
-**Privacy Risk Management Process** – Organizational privacy risk management practices are not formalized, and risk is managed in an ad hoc and sometimes reactive manner. Prioritization of privacy activities may not be directly informed by organizational risk management priorities, privacy risk assessments, or mission or business objectives.
-
-**Integrated Privacy Risk Management Program** – There is limited awareness of privacy risk at the organizational level. The organization implements privacy risk management on an irregular, case-by-case basis due to varied experience or information gained from outside sources. The organization may not have processes that enable the sharing of information about data processing and resulting privacy risks within the organization.
-
-**Data Processing Ecosystem Relationships** – There is limited understanding of an organization’s role(s) in the larger ecosystem with respect to other entities (e.g., buyers, suppliers, service providers, business associates, partners). The organization does not have processes for identifying how privacy risks may proliferate throughout the ecosystem or for communicating privacy risks or requirements to other entities in the ecosystem.
-
-**Workforce** – Some personnel may have a limited understanding of privacy risks or privacy risk management processes, but have no specific privacy responsibilities. If available, privacy training is ad hoc and the content is not kept current with best practices.
-""",
-    2: """
-### Tier 2: Risk Informed
-
-**Privacy Risk Management Process** – Risk management practices are approved by management but may not be established as organization-wide policy. Prioritization of privacy activities is directly informed by organizational risk management priorities, privacy risk assessments, or mission or business objectives.
-
-**Integrated Privacy Risk Management Program** – There is an awareness of privacy risk at the organizational level, but an organization-wide approach to managing privacy risk has not been established. Information about data processing and resulting privacy risks is shared within the organization on an informal basis. Consideration of privacy in organizational objectives and programs may occur at some but not all levels of the organization. Privacy risk assessment occurs, but is not typically repeatable or reoccurring.
-
-**Data Processing Ecosystem Relationships** – There is some understanding of an organization’s role(s) in the larger ecosystem with respect to other entities (e.g., buyers, suppliers, service providers, business associates, partners). The organization is aware of the privacy ecosystem risks associated with the products and services it provides and uses, but does not act consistently or formally upon those risks.
-
-**Workforce** – There are personnel with specific privacy responsibilities, but they may have non-privacy responsibilities as well. Privacy training is conducted regularly for privacy personnel, although there is no consistent process for updates on best practices.
-""",
-    3: """
-### Tier 3: Repeatable
-
-**Privacy Risk Management Process** – The organization’s risk management practices are formally approved and expressed as policy. Organizational privacy practices are regularly updated based on the application of risk management processes to changes in mission or business objectives and a changing risk, policy, and technology landscape.
-
-**Integrated Privacy Risk Management Program** – There is an organization-wide approach to manage privacy risk. Risk-informed policies, processes, and procedures are defined, implemented as intended, and reviewed. Consistent methods are in place to respond effectively to changes in risk. Senior privacy and non-privacy executives communicate regularly regarding privacy risk. Senior executives ensure consideration of privacy through all lines of operation in the organization.
-
-**Data Processing Ecosystem Relationships** – The organization understands its role(s), dependencies, and dependents in the larger ecosystem and may contribute to the community’s broader understanding of risks. The organization is aware of the privacy ecosystem risks associated with the products and services it provides and uses. Additionally, it usually acts formally upon those risks, including mechanisms such as written agreements to communicate privacy requirements, governance structures, and policy implementation and monitoring.
-
-**Workforce** – Dedicated privacy personnel possess the knowledge and skills to perform their appointed roles and responsibilities. There is regular, up-to-date privacy training for all personnel.
-""",
-    4: """
-### Tier 4: Adaptive
-
-**Privacy Risk Management Process** – The organization adapts its privacy practices based on lessons learned from privacy events, and identification of new privacy risks. Through a process of continuous improvement incorporating advanced privacy technologies and practices, the organization actively adapts to a changing policy and technology landscape and responds in a timely and effective manner to evolving privacy risks.
-
-**Integrated Privacy Risk Management Program** – There is an organization-wide approach to managing privacy risk that uses risk-informed policies, processes, and procedures to address problematic data actions. The relationship between privacy risk and organizational objectives is clearly understood and considered when making decisions. Senior executives monitor privacy risk in the same context as cybersecurity risk, financial risk, and other organizational risks. The organizational budget is based on an understanding of the current and predicted risk environment and risk tolerance. Business units implement executive vision and analyze system-level risks in the context of the organizational risk tolerances. Privacy risk management is part of the organizational culture and evolves from lessons learned and continuous awareness of data processing and resulting privacy risks. The organization can quickly and efficiently account for changes to business/mission objectives in how risk is approached and communicated.
-
-**Data Processing Ecosystem Relationships** – The organization understands its role(s), dependencies, and dependents in the larger ecosystem and contributes to the community’s broader understanding of risks. The organization uses real-time or near-real-time information to understand and consistently act upon privacy ecosystem risks associated with the products and services it provides and it uses. Additionally, it communicates proactively, using formal (e.g., agreements) and informal mechanisms to develop and maintain strong ecosystem relationships.
-
-**Workforce** – The organization has specialized privacy skillsets throughout the organizational structure; personnel with diverse perspectives contribute to the management of privacy risks. There is regular, up-to-date, specialized privacy training for all personnel. Personnel at all levels understand the organizational privacy values and their role in maintaining them.
-"""
-}
-
-# ----------- Calculate Overall Tier ----------- #
-overall_tier = 0
-for tier in range(1, 5):
-    tier_tasks = [t for t in roadmap if t["tier"] == tier]
-    if tier_tasks and all(t["id"] in completed_ids for t in tier_tasks):
-        overall_tier = tier
-    else:
-        break
-
-st.session_state["overall_tier"] = overall_tier
+    rerun.stop()
 
-# ----------- Display Overall Tier ----------- #
-st.subheader("🎯 Your Overall Tier")
-
-if overall_tier > 0:
-    st.success(f"You have achieved **Tier {overall_tier}**")
-    st.markdown(tier_definitions[overall_tier])
-else:
-    st.warning("❌ No overall tier achieved yet.")
-    st.info("Complete all Tier 1 tasks to unlock Tier 1 status.")
+# ----------- Overall Tier (filled in below the form, once the answers are final) ----------- #
+rerun.phase("widget_render")
+completed_mask = st.session_state["completed_mask"]
+tier_section = st.container()
 
 # ----------- Roadmap Setup Questions ----------- #
 st.divider()
@@ -98,11 +34,11 @@ with st.form("roadmap_questions"):
     q2 = st.radio("2. Do you disclose information to third parties?", ["Yes", "No"])
     q3 = st.radio("3. Do you determine the purposes and means of the personal information you process?", ["Yes", "No"])
 
-    certificate = st.radio("4. Are you pursuing a certification?", ["SOC 2", "None"])
-    st.caption("Only SOC 2 is available for now. More will be added soon.")
+    certificate = st.radio("4. Are you pursuing a certification?", [catalog.framework.name, "None"])
+    st.caption("The framework is chosen on the Onboarding page.")
 
     custom_targets = {}
-    categories = sorted(set(t["category"] for t in roadmap))
+    categories = roadmap_index.categories
 
     if certificate == "None":
         st.markdown("### 🎯 Choose Your Target Tier Per Category")
@@ -119,6 +55,7 @@ with st.form("roadmap_questions"):
 
 # ----------- Save Questions to Session ----------- #
 if submitted:
+    rerun.phase("submit")
     st.session_state["questions"] = {
         "third_party_collection": q1 == "Yes",
         "third_party_disclosure": q2 == "Yes",
@@ -126,4 +63,74 @@ if submitted:
         "certificate": certificate,
         "custom_targets": custom_targets
     }
+
+# ----------- Calculate Overall Tier ----------- #
+# Over the tasks that apply to the saved answers, as on the Profile page and in the
+# what-if table below; every question counts as "Yes" until the answers are saved
+rerun.phase("tier_computation")
+saved = st.session_state.get("questions")
+current_answers = answers_of(saved)
+overall_tier, current_category_tiers = roadmap_index.evaluate_tiers(
+    completed_mask, roadmap_index.combination_masks[current_answers]
+)
+st.session_state["overall_tier"] = overall_tier
+
+if submitted:
+    persist_questions(saved, overall_tier)
     st.success("✅ Responses saved! You can now continue to your roadmap.")
+
+# ----------- Display Overall Tier ----------- #
+rerun.phase("widget_render")
+with tier_section:
+    st.subheader("🎯 Your Overall Tier")
+    if overall_tier > 0:
+        st.success(f"You have achieved **Tier {overall_tier}**")
+        st.markdown(TIER_DEFINITIONS[overall_tier])
+    else:
+        st.warning("❌ No overall tier achieved yet.")
+        st.info("Complete all Tier 1 tasks to unlock Tier 1 status.")
+    if saved:
+        st.caption("Counted over the tasks that apply to your saved setup answers.")
+    else:
+        st.caption("Counted as if you answered “Yes” to every setup question; save your answers below to refine it.")
+
+# ----------- What-if Comparison ----------- #
+# Evaluated in one batch from the saved answers and targets, without submitting the form
+rerun.phase("what_if")
+st.divider()
+st.subheader("🔮 What-if Comparison")
+st.caption("See how the workload shifts with other answers or target tiers before changing them above.")
+
+profiles = target_profiles(roadmap_index, current_category_tiers, (saved or {}).get("custom_targets"))
+
+mode = st.radio("Compare", ["Answer combinations", "Target profiles"], horizontal=True, key="what_if_mode")
+if mode == "Answer combinations":
+    profile = st.selectbox("Target profile", list(profiles), key="what_if_profile")
+    outcomes = simulate(roadmap_index, completed_mask, ANSWER_COMBINATIONS, {profile: profiles[profile]})
+else:
+    outcomes = simulate(roadmap_index, completed_mask, [current_answers], profiles)
+
+def yes_no(value):
+    return "Yes" if value else "No"
+
+rows = []
+for outcome in outcomes:
+    collection, disclosure, is_controller = outcome.answers
+    row = {"scenario": outcome.profile} if mode == "Target profiles" else {
+        "3rd-party collection": yes_no(collection),
+        "3rd-party disclosure": yes_no(disclosure),
+        "controller": yes_no(is_controller),
+        "yours": "✓" if outcome.answers == current_answers else "",
+    }
+    row.update({
+        "applicable tasks": outcome.applicable,
+        "tasks to go": outcome.remaining,
+        **{f"Tier {tier} to go": count for tier, count in outcome.remaining_by_tier.items()},
+        "overall tier now": outcome.overall_tier,
+        "overall tier at target": outcome.overall_at_target,
+        "categories at target": f"{outcome.categories_at_target}/{len(roadmap_index.categories)}",
+    })
+    rows.append(row)
+st.dataframe(rows, hide_index=True)
+
+rerun.finish()
@@ -1,77 +1,174 @@
 import streamlit as st
-import json
+from metrics import start_rerun
+from org_session import current_catalog, persist_completed, sync_organization
+from planner import plan_next_tiers, show_plan
+from progress import get_progress_tracker
+from roadmap_engine import ROLE_FILTERS, mask_count
 
-# --- Load roadmap data ---
-@st.cache_data
-def load_roadmap():
-    with open("roadmap_data.json", "r") as f:
-        return json.load(f)
+PAGE_SIZES = [25, 50, 100, 200]
+DEFAULT_PAGE_SIZE = 50
 
-roadmap = load_roadmap()
+rerun = start_rerun("Roadmap")
 
-# ✅ Sort roadmap by tier before display
-roadmap.sort(key=lambda x: x["tier"])
+# --- Load roadmap data (indexed, with its display order precomputed) ---
+sync_organization()
+rerun.phase("data_load")
+roadmap_index = current_catalog().index
 
 st.title("Your Task List")
 
 # --- Validate session state ---
-if "questions" not in st.session_state or "completed_tasks" not in st.session_state:
+if "questions" not in st.session_state or "completed_mask" not in st.session_state:
     st.warning("Please complete onboarding and tier profile first.")
-    st.stop()
-
-completed = set(st.session_state["completed_tasks"])
+    rerun.stop()
+
+# --- Update session state on save (runs before the rerun that redraws the list) ---
+def save_completions(task_ids):
+    new_completions = [task_id for task_id in task_ids if st.session_state.get(f"todo_{task_id}")]
+    if new_completions:
+        # O(1) per ticked task: keeps the profile pages' tier counters current without a rescan
+        completed_mask = st.session_state["completed_mask"]
+        get_progress_tracker(st.session_state, roadmap_index).update(new_completions, completed_mask)
+        st.session_state["completed_mask"] = completed_mask | roadmap_index.ids_to_mask(new_completions)
+        # Logged with the role the person saving declared, for the audit trail
+        persist_completed(new_completions, role=st.session_state.get("completed_by_role"))
+
+completed_mask = st.session_state["completed_mask"]
 questions = st.session_state["questions"]
 custom_targets = questions.get("custom_targets", {})
 
-# --- Role filter options (with 'All Roles' option) ---
-user_roles = ["All Roles", "Process Manager", "Operations Level", "Executive Level"]
-selected_role = st.selectbox("Filter tasks by role (optional):", user_roles)
+# --- Next-tier plan: the outstanding tasks that unlock each category's next tier ---
+rerun.phase("planning")
+tracker = get_progress_tracker(st.session_state, roadmap_index)
+plan = plan_next_tiers(
+    roadmap_index, completed_mask, tracker.applicable_mask,
+    tracker.category_tiers(), tracker.overall_tier(), custom_targets,
+)
+with st.expander(f"🧭 Fastest path to your next tiers ({len(plan.tasks)} tasks)"):
+    show_plan(plan)
+    plan_only = st.toggle("List only these tasks below", key="roadmap_plan_only")
+
+# --- Search and facet filters ---
+# Facet counts are read from the widgets' state before they are drawn: each facet counts
+# matches under every other active filter, so its numbers show what picking it would give.
+status_filters = {"Not done": ~completed_mask, "Done": completed_mask, "All": roadmap_index.all_mask}
+tier_filters = sorted(roadmap_index.tier_masks)
+user_roles = ["All Roles", *ROLE_FILTERS]
+
+query = st.text_input("🔎 Search tasks", key="roadmap_query", placeholder="e.g. vendor contracts, retention")
+
+rerun.phase("filtering")
+catalog_search = current_catalog().search
+match = catalog_search.search(query)
+# Applicable to the setup answers and within each category's target tier
+base = roadmap_index.applicable_mask(questions) & roadmap_index.target_mask(custom_targets)
+if match:
+    base &= match[0]
+if plan_only:
+    base &= plan.mask
+
+selected_status = st.session_state.get("roadmap_status", "Not done")
+selected_categories = st.session_state.get("roadmap_categories", [])
+selected_tiers = st.session_state.get("roadmap_tiers", [])
+selected_role = st.session_state.get("roadmap_role", "All Roles")
+
+facet_masks = {
+    "status": status_filters.get(selected_status, status_filters["Not done"]),
+    "category": roadmap_index.all_mask,
+    "tier": roadmap_index.all_mask,
+    "role": roadmap_index.all_mask,
+}
+if selected_categories:
+    facet_masks["category"] = 0
+    for category in selected_categories:
+        facet_masks["category"] |= roadmap_index.category_masks.get(category, 0)
+if selected_tiers:
+    facet_masks["tier"] = 0
+    for tier in selected_tiers:
+        facet_masks["tier"] |= roadmap_index.tier_masks.get(tier, 0)
+if selected_role != "All Roles":
+    facet_masks["role"] = roadmap_index.role_mask(selected_role)
+
+def facet_base(facet):
+    mask = base
+    for name, facet_mask in facet_masks.items():
+        if name != facet:
+            mask &= facet_mask
+    return mask
+
+status_base = facet_base("status")
+status_counts = {status: mask_count(status_base & m) for status, m in status_filters.items()}
+category_base = facet_base("category")
+category_counts = {c: mask_count(category_base & m) for c, m in roadmap_index.category_masks.items()}
+tier_base = facet_base("tier")
+tier_counts = {tier: mask_count(tier_base & roadmap_index.tier_masks[tier]) for tier in tier_filters}
+role_base = facet_base("role")
+role_counts = {"All Roles": mask_count(role_base)}
+role_counts.update((label, mask_count(role_base & roadmap_index.role_mask(label))) for label in ROLE_FILTERS)
+
+rerun.phase("widget_render")
+st.selectbox(
+    "Filter tasks by role (optional):", user_roles, key="roadmap_role",
+    format_func=lambda role: f"{role} ({role_counts[role]})",
+)
+with st.expander("Filter by category, tier and status", expanded=bool(selected_categories or selected_tiers)):
+    st.radio(
+        "Status", list(status_filters), key="roadmap_status", horizontal=True,
+        format_func=lambda status: f"{status} ({status_counts[status]})",
+    )
+    st.multiselect(
+        "Categories", list(roadmap_index.categories), key="roadmap_categories",
+        format_func=lambda category: f"{category} ({category_counts[category]})",
+    )
+    st.multiselect(
+        "Tiers", tier_filters, key="roadmap_tiers",
+        format_func=lambda tier: f"Tier {tier} ({tier_counts[tier]})",
+    )
+
+visible = base
+for facet_mask in facet_masks.values():
+    visible &= facet_mask
 
 # --- Prepare roadmap display ---
-st.subheader("📋 Remaining Tasks")
-new_completions = []
-roadmap_displayed = False
-
-for task in roadmap:
-    task_id = task["id"]
-    category = task["category"]
-    tier = task["tier"]
-    role = task.get("role", "")
-    task_type = task.get("type", "").lower()
-
-    # Skip completed tasks
-    if task_id in completed:
-        continue
-
-    # Skip if tier exceeds selected target
-    if custom_targets:
-        max_tier = custom_targets.get(category, 4)
-        if tier > max_tier:
-            continue
-
-    # --- ✅ Skip by role only if a specific role is selected ---
-    if selected_role != "All Roles" and selected_role.lower() not in role.lower():
-        continue
-
-    # Skip based on third-party and controller logic
-    if task.get("third_party_collection") and not questions.get("third_party_collection"):
-        continue
-    if task.get("third_party_disclosure") and not questions.get("third_party_disclosure"):
-        continue
-    if "controller" in task_type and not questions.get("is_controller"):
-        continue
-
-    # Show the task
-    roadmap_displayed = True
-    label = f"**[{category}] (Tier {tier})** {task['task']}"
-    checked = st.checkbox(label, key=f"todo_{task_id}")
-    if checked:
-        new_completions.append(task_id)
-
-# --- Update session state if needed ---
-if new_completions:
-    st.session_state["completed_tasks"] = list(completed.union(new_completions))
+st.subheader("🔎 Search Results" if match else "📋 Remaining Tasks")
+
+# --- Pagination: only one page of checkboxes is sent to the browser ---
+remaining_count = mask_count(visible)
+page_size = st.selectbox("Tasks per page:", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE))
+page_count = max(1, (remaining_count + page_size - 1) // page_size)
+if st.session_state.get("roadmap_page", 1) > page_count:
+    st.session_state["roadmap_page"] = page_count
+page = st.number_input("Page", min_value=1, max_value=page_count, step=1, key="roadmap_page") if page_count > 1 else 1
+
+start = (page - 1) * page_size
+if match:
+    # Best matches first; only the tasks passing every filter are scored
+    page_tasks = catalog_search.ranked(visible, match[1], start, start + page_size)
+else:
+    page_tasks = roadmap_index.tasks_in_mask(visible, start, start + page_size)
+
+# --- Task checklist: ticks are collected in a form and saved in one rerun ---
+if page_tasks:
+    st.caption(f"Showing tasks {start + 1}–{start + len(page_tasks)} of {remaining_count}")
+    with st.form("roadmap_tasks"):
+        group = None
+        for task in page_tasks:
+            if (task.category, task.tier) != group:
+                group = (task.category, task.tier)
+                st.markdown(f"#### {task.category} · Tier {task.tier}")
+            if completed_mask >> roadmap_index.position[task.id] & 1:
+                st.checkbox(task.task, value=True, disabled=True, key=f"done_{task.id}")
+            else:
+                st.checkbox(task.task, key=f"todo_{task.id}")
+        st.selectbox("Completed by (your role)", ROLE_FILTERS, key="completed_by_role")
+        st.form_submit_button(
+            "✅ Save Completed Tasks", on_click=save_completions, args=([t.id for t in page_tasks],)
+        )
 
 # --- Feedback if all done ---
-if not roadmap_displayed:
+elif match is not None and not mask_count(match[0]):
+    st.info(f"No tasks match “{query}”.")
+else:
     st.success("🎉 All tasks for your selected filters and target tiers are complete!")
+
+rerun.finish()
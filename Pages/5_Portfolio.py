@@ -0,0 +1,51 @@
+import streamlit as st
+from catalogs import available_frameworks
+from metrics import start_rerun
+from org_session import current_framework, sync_organization
+from portfolio import get_portfolio
+
+st.set_page_config(layout="wide")
+rerun = start_rerun("Portfolio")
+sync_organization()
+
+st.title("📊 Portfolio Overview")
+st.caption("Tier status and progress across every saved organization.")
+
+# ----------- Framework ----------- #
+frameworks = available_frameworks()
+framework = st.selectbox("Framework", frameworks, index=frameworks.index(current_framework()))
+
+# ----------- Refresh Materialized Aggregates ----------- #
+# Only organizations saved since the last refresh (by any session or server) are re-read
+rerun.phase("data_load")
+portfolio = get_portfolio(framework)
+changed = portfolio.refresh()
+summary = portfolio.summary()
+
+rerun.phase("widget_render")
+if not summary["organizations"]:
+    st.info("No organizations have saved progress on this framework yet.")
+    rerun.stop()
+
+# ----------- Overall Tier Distribution ----------- #
+st.subheader("Overall Tier")
+columns = st.columns(len(summary["tier_counts"]))
+for column, (tier, count) in zip(columns, summary["tier_counts"].items()):
+    column.metric("Not started" if tier == 0 else f"Tier {tier}", count)
+st.caption(f"{summary['organizations']} organizations · {changed} updated since the last refresh")
+
+# ----------- Category Progress ----------- #
+st.divider()
+st.subheader("Category Progress")
+st.caption("Share of applicable tasks completed, and how many organizations have reached each tier.")
+st.dataframe(summary["categories"], hide_index=True)
+
+# ----------- Most Common Outstanding Tasks ----------- #
+st.divider()
+st.subheader("Most Common Outstanding Tasks")
+if summary["outstanding"]:
+    st.dataframe(summary["outstanding"], hide_index=True)
+else:
+    st.success("🎉 Every organization has completed all of its applicable tasks.")
+
+rerun.finish()
@@ -0,0 +1,155 @@
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import NamedTuple
+
+from catalogs import DEFAULT_FRAMEWORK, FRAMEWORKS, get_catalog
+
+MAX_WORKERS = os.cpu_count() or 1
+# Organizations queued per worker: enough to keep the pool busy without reading all input up front
+PENDING_PER_WORKER = 4
+
+
+# ------------------ Profile Computation ------------------ #
+class Profile(NamedTuple):
+    org: str
+    framework: str
+    overall_tier: int
+    category_tiers: dict
+    remaining_targets: dict
+
+    def as_dict(self):
+        return self._asdict()
+
+
+def compute_profile(org, completed_ids, questions=None, framework=DEFAULT_FRAMEWORK):
+    # Same result as the Profile page: tiers over the tasks that apply to the setup answers
+    catalog = get_catalog(framework)
+    index = catalog.index
+    overall_tier, category_tiers = index.evaluate_tiers(
+        index.ids_to_mask(completed_ids), index.applicable_mask(questions)
+    )
+    return Profile(
+        org,
+        catalog.framework.name,
+        overall_tier,
+        category_tiers,
+        catalog.templates.remaining_targets(category_tiers),
+    )
+
+
+def render_report(profile):
+    templates = get_catalog(profile.framework).templates
+    return templates.render(profile.overall_tier, profile.category_tiers, profile.remaining_targets)
+
+
+# ------------------ Input ------------------ #
+class UnreadableRecord(dict):
+    # An error result from read_records; run_batch passes it through without a worker
+    pass
+
+
+def _parse_record(text, default_org):
+    # A record, or an error result if it is not a JSON object
+    try:
+        record = json.loads(text)
+    except ValueError as e:
+        return UnreadableRecord(org=default_org, error=f"{type(e).__name__}: {e}")
+    if not isinstance(record, dict):
+        return UnreadableRecord(org=default_org, error=f"expected a JSON object, got {type(record).__name__}")
+    record.setdefault("org", default_org)
+    return record
+
+
+def read_records(path):
+    # A directory of one-org JSON files, or a JSONL file with one org per line:
+    # {"org": ..., "framework": ..., "questions": {...}, "completed_tasks": [...]}
+    # A file or line that cannot be read comes out as an error result, like a failed profile.
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.endswith(".json"):
+                org = name[:-len(".json")]
+                try:
+                    with open(os.path.join(path, name), encoding="utf-8") as f:
+                        text = f.read()
+                except (OSError, UnicodeDecodeError) as e:
+                    yield UnreadableRecord(org=org, error=f"{type(e).__name__}: {e}")
+                    continue
+                yield _parse_record(text, org)
+        return
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for number, line in enumerate(f, start=1):
+            if line.strip():
+                yield _parse_record(line, f"line {number}")
+
+
+def _pdf_name(org):
+    return re.sub(r"[^\w.-]+", "_", org).strip("_") or "profile"
+
+
+# ------------------ Worker ------------------ #
+def process_record(record, pdf_dir=None):
+    # Runs in a worker process; catalogs are loaded once per worker by get_catalog()
+    org = str(record["org"])
+    # Task ids are row numbers per framework, so a record must name one exactly
+    framework = record.get("framework") or DEFAULT_FRAMEWORK
+    if framework not in FRAMEWORKS:
+        return {"org": org, "error": f"unknown framework {framework!r}; expected one of {sorted(FRAMEWORKS)}"}
+    completed_tasks = record.get("completed_tasks", [])
+    if not isinstance(completed_tasks, list):
+        return {"org": org, "error": f"completed_tasks must be a list of task ids, got {type(completed_tasks).__name__}"}
+    try:
+        profile = compute_profile(org, completed_tasks, record.get("questions"), framework)
+        result = profile.as_dict()
+        if pdf_dir:
+            from pdf_export import html_to_pdf
+
+            pdf_path = os.path.join(pdf_dir, _pdf_name(org) + ".pdf")
+            with open(pdf_path, "wb") as f:
+                f.write(html_to_pdf(render_report(profile)))
+            result["pdf"] = pdf_path
+        return result
+    except Exception as e:  # one bad organization must not stop the batch
+        return {"org": org, "error": f"{type(e).__name__}: {e}"}
+
+
+def run_batch(records, pdf_dir=None, max_workers=MAX_WORKERS):
+    # Yields each organization's result as soon as it finishes, in completion order.
+    # Records are submitted a bounded window at a time, so results stream out while the
+    # input is still being read; input errors are passed straight through.
+    window = max(1, max_workers) * PENDING_PER_WORKER
+    with ProcessPoolExecutor(max_workers) as executor:
+        pending = set()
+        for record in records:
+            if isinstance(record, UnreadableRecord):
+                yield record
+                continue
+            pending.add(executor.submit(process_record, record, pdf_dir))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute tier profiles (and optionally PDF reports) for many organizations.")
+    parser.add_argument("input", help="directory of <org>.json files or a JSONL file")
+    parser.add_argument("--pdf-dir", help="also render each profile as a PDF into this directory")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    if args.pdf_dir:
+        os.makedirs(args.pdf_dir, exist_ok=True)
+    failures = 0
+    # One JSON line per organization on stdout, flushed as it completes
+    for result in run_batch(read_records(args.input), args.pdf_dir, args.workers):
+        failures += "error" in result
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+    sys.exit(1 if failures else 0)
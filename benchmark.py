@@ -0,0 +1,259 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from planner import plan_next_tiers
+from progress import ProgressTracker
+from catalogs import onboarding_layout
+from report_templates import ReportTemplates
+from simulator import ANSWER_COMBINATIONS, answers_of, simulate, target_profiles
+from task_search import TaskSearch
+from roadmap_engine import ROLE_FILTERS, TIERS, RoadmapIndex, Task, load_tasks, mask_count
+
+SIZES = (1_000, 10_000, 100_000)
+REPEAT = 5
+PAGE_SIZE = 50
+RESULTS_FILE = "benchmark_results.json"
+# A path counts as regressed when its median is this much slower than the baseline
+REGRESSION_THRESHOLD = 1.25
+
+ROLES = ("Executive Level", "Process Manager", "Operations Level", "Process Manager Level & Operations Level")
+TYPES = ("Controller", "Processor", "Controller & Processor")
+# Task text vocabulary, so the search index sees realistic term frequencies
+WORDS = (
+    "establish review document policy procedure privacy data personal retention vendor contract access "
+    "control consent notice breach incident response training employee inventory risk assessment "
+    "disclosure third party processing record request deletion encryption monitor audit report"
+).split()
+QUERIES = ("vendor", "data retention", "priv", "third party contract review")
+
+
+# ------------------ Synthetic Catalogs ------------------ #
+def synthetic_catalog(size, seed=0):
+    # Same shape as roadmap_data.json, with more categories as the catalog grows
+    rng = random.Random(seed)
+    categories = [f"Category {i:03}" for i in range(max(8, size // 250))]
+    tasks = [
+        Task(
+            id=f"T{i + 1:06}",
+            category=sys.intern(rng.choice(categories)),
+            task=" ".join(rng.choices(WORDS, k=rng.randint(6, 20))),
+            tier=rng.choice(TIERS),
+            role=sys.intern(rng.choice(ROLES)),
+            type=sys.intern(rng.choice(TYPES)),
+            third_party_collection=rng.random() < 0.2,
+            third_party_disclosure=rng.random() < 0.2,
+        )
+        for i in range(size)
+    ]
+    milestones = {category: {tier: f"{category} milestone for tier {tier}." for tier in TIERS} for category in categories}
+    return tasks, milestones
+
+
+def synthetic_session(index, seed=0):
+    # Onboarding picks, the resulting completed ids, and a typical set of setup answers
+    rng = random.Random(seed)
+    selected_tiers = {category: rng.choice((0, *TIERS)) for category in index.categories}
+    completed_mask = 0
+    for category, tier in selected_tiers.items():
+        completed_mask |= index.mask_up_to_tier(category, tier)
+    completed = set(index.mask_to_ids(completed_mask))
+    completed.update(t.id for t in index.tasks if rng.random() < 0.1)
+    questions = {
+        "third_party_collection": True,
+        "third_party_disclosure": False,
+        "is_controller": True,
+        "certificate": "None",
+        "custom_targets": {category: rng.choice(TIERS) for category in index.categories},
+    }
+    return selected_tiers, list(completed), questions
+
+
+# ------------------ Timing ------------------ #
+def measure(fn, repeat=REPEAT):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"min_ms": round(min(timings), 4), "median_ms": round(statistics.median(timings), 4), "repeat": repeat}
+
+
+def bench_size(size, repeat=REPEAT, pdf=False):
+    tasks, milestones = synthetic_catalog(size)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "roadmap_data.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([t._asdict() for t in tasks], f)
+
+        # The JSON path parses and builds records only; writing the compiled file is a
+        # one-off that load_tasks() pays on the first load, not on every cold start
+        def load_json():
+            with open(path, "rb") as f:
+                return [Task.from_dict(row) for row in json.loads(f.read())]
+
+        results["catalog_load_json"] = measure(load_json, repeat)
+        load_tasks(path)  # writes roadmap_data.bin
+        results["catalog_load_compiled"] = measure(lambda: load_tasks(path), repeat)
+
+    results["index_build"] = measure(lambda: RoadmapIndex(tasks), repeat)
+    index = RoadmapIndex(tasks)
+    selected_tiers, completed, questions = synthetic_session(index)
+    completed_mask = index.ids_to_mask(completed)
+
+    # 1_Onboarding.py: cumulative masks for every category's selected tier, and the ids to persist
+    def onboarding_submit():
+        completed_mask = 0
+        for category, tier in selected_tiers.items():
+            completed_mask |= index.mask_up_to_tier(category, tier)
+        return completed_mask, index.mask_to_ids(completed_mask)
+
+    results["onboarding_submit"] = measure(onboarding_submit, repeat)
+    results["onboarding_layout"] = measure(lambda: onboarding_layout(milestones), repeat)
+
+    # 2_Tier_Profile_and_Questions.py: overall tier over every task
+    results["tier_profile"] = measure(lambda: index.evaluate_tiers(completed_mask), repeat)
+
+    # 4_Profile.py: first visit builds the session tracker, later visits read it
+    applicable = index.applicable_mask(questions)
+
+    def profile_first_visit():
+        tracker = ProgressTracker(index, completed_mask, applicable)
+        return tracker.overall_tier(), tracker.category_tiers()
+
+    results["profile_first_visit"] = measure(profile_first_visit, repeat)
+    tracker = ProgressTracker(index, completed_mask, applicable)
+    results["profile_rerun"] = measure(lambda: (tracker.overall_tier(), tracker.category_tiers()), repeat)
+    # Roadmap "Save Completed Tasks": a fresh page of ticked tasks per run
+    completed_set = set(completed)
+    pending = [t.id for t in index.tasks if t.id not in completed_set]
+    batches = iter([pending[i:i + PAGE_SIZE] for i in range(0, PAGE_SIZE * repeat, PAGE_SIZE)])
+    def save_completions():
+        batch = next(batches)
+        tracker.update(batch, completed_mask)
+        return completed_mask | index.ids_to_mask(batch)
+
+    results["profile_tracker_update"] = measure(save_completions, repeat)
+
+    # 2_Tier_Profile_and_Questions.py what-if table: all answer combinations, then all target profiles
+    profiles = target_profiles(index, tracker.category_tiers(), questions["custom_targets"])
+    results["what_if_answers"] = measure(
+        lambda: simulate(index, completed_mask, ANSWER_COMBINATIONS, {"Your targets": profiles["Your targets"]}), repeat
+    )
+    results["what_if_profiles"] = measure(
+        lambda: simulate(index, completed_mask, [answers_of(questions)], profiles), repeat
+    )
+
+    # 3_Roadmap.py and 4_Profile.py: next-tier plan, recomputed on every rerun
+    overall_tier, category_tiers = tracker.overall_tier(), tracker.category_tiers()
+    results["next_tier_plan"] = measure(
+        lambda: plan_next_tiers(index, completed_mask, applicable, category_tiers, overall_tier,
+                                questions["custom_targets"]),
+        repeat,
+    )
+
+    # 3_Roadmap.py: visible mask, count and one page of tasks, with and without a role filter
+    def roadmap_filter(role=None):
+        mask = applicable & index.target_mask(questions["custom_targets"]) & ~completed_mask
+        if role:
+            mask &= index.role_mask(role)
+        count = mask_count(mask)
+        return count, index.tasks_in_mask(mask, 0, PAGE_SIZE)
+
+    results["roadmap_filter"] = measure(roadmap_filter, repeat)
+    results["roadmap_filter_role"] = measure(lambda: roadmap_filter(ROLE_FILTERS[0]), repeat)
+
+    # 3_Roadmap.py search: index built once per catalog, then match, facet counts and one ranked page
+    results["search_index_build"] = measure(lambda: TaskSearch(index), max(1, repeat // 5))
+    search = TaskSearch(index)
+    queries = iter(QUERIES * repeat)
+
+    def roadmap_search():
+        match_mask, expanded = search.search(next(queries))
+        mask = applicable & index.target_mask(questions["custom_targets"]) & match_mask
+        counts = {c: mask_count(mask & m) for c, m in index.category_masks.items()}
+        counts.update((tier, mask_count(mask & m)) for tier, m in index.tier_masks.items())
+        return counts, search.ranked(mask & ~completed_mask, expanded, 0, PAGE_SIZE)
+
+    results["roadmap_search"] = measure(roadmap_search, repeat)
+
+    # Report: fragment pre-rendering (once per process), then per-profile assembly
+    results["report_templates_build"] = measure(lambda: ReportTemplates(milestones).prerender(), repeat)
+    templates = ReportTemplates(milestones).prerender()
+    overall_tier, category_tiers = index.evaluate_tiers(completed_mask, applicable)
+    remaining = templates.remaining_targets(category_tiers)
+    results["report_html"] = measure(lambda: templates.render(overall_tier, category_tiers, remaining), repeat)
+    if pdf:
+        from pdf_export import html_to_pdf
+
+        html = templates.render(overall_tier, category_tiers, remaining)
+        results["report_pdf"] = measure(lambda: html_to_pdf(html), max(1, repeat // 5))
+    return results
+
+
+# ------------------ Reporting ------------------ #
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    # (size, path, baseline ms, current ms) for every path slower than the threshold allows
+    previous = {(r["size"], r["path"]): r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        old = previous.get((r["size"], r["path"]))
+        if old and r["median_ms"] > old["median_ms"] * threshold:
+            regressions.append((r["size"], r["path"], old["median_ms"], r["median_ms"]))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the app's hot paths on synthetic catalogs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="catalog sizes in tasks")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="runs per measurement")
+    parser.add_argument("--pdf", action="store_true", help="also time PDF rendering (slow on large catalogs)")
+    parser.add_argument("--output", default=RESULTS_FILE, help="where to write the JSON results")
+    parser.add_argument("--baseline", help="earlier results file; exit 1 if any path regressed")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="allowed median slowdown against the baseline (default: %(default)s)")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        for name, timing in bench_size(size, args.repeat, args.pdf).items():
+            results.append({"size": size, "path": name, **timing})
+            print(f"{size:>8} {name:<26} median {timing['median_ms']:>10.3f} ms  min {timing['min_ms']:>10.3f} ms", flush=True)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for size, name, old, new in regressions:
+            print(f"❌ {name} at {size} tasks: {old:.3f} ms -> {new:.3f} ms", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
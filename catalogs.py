@@ -0,0 +1,99 @@
+import os
+from functools import lru_cache
+from types import MappingProxyType
+from typing import NamedTuple
+
+from report_templates import ReportTemplates, load_report_templates
+from roadmap_engine import load_roadmap_index
+from task_search import TaskSearch
+
+DEFAULT_FRAMEWORK = "SOC 2"
+# Indexed frameworks kept in memory per server process; the least recently used one is dropped first
+MAX_LOADED_FRAMEWORKS = 3
+
+
+# ------------------ Framework Registry ------------------ #
+class Framework(NamedTuple):
+    name: str
+    roadmap_csv: str
+    roadmap_file: str
+    milestones_file: str
+
+    def is_available(self):
+        return os.path.exists(self.roadmap_file) and os.path.exists(self.milestones_file)
+
+
+def _catalog_dir(slug):
+    folder = os.path.join("catalogs", slug)
+    return (
+        os.path.join(folder, "roadmap.csv"),
+        os.path.join(folder, "roadmap_data.json"),
+        os.path.join(folder, "milestones.csv"),
+    )
+
+
+FRAMEWORKS = {
+    framework.name: framework
+    for framework in (
+        Framework(
+            "SOC 2",
+            "SOC 2 to NIST Privacy Framework - Roadmap.csv",
+            "roadmap_data.json",
+            "SOC 2 to NIST Privacy Framework - Milestone Descriptions.csv",
+        ),
+        # Further mappings are picked up once their files are added under catalogs/<slug>/
+        Framework("ISO 27701", *_catalog_dir("iso27701")),
+        Framework("GDPR", *_catalog_dir("gdpr")),
+        Framework("HIPAA", *_catalog_dir("hipaa")),
+    )
+}
+
+
+def available_frameworks():
+    # Only a file-existence check: nothing is parsed until a session selects the framework
+    return [name for name, framework in FRAMEWORKS.items() if framework.is_available()]
+
+
+# ------------------ Onboarding Form Layout ------------------ #
+class OnboardingCategory(NamedTuple):
+    category: str
+    markdown: str  # divider, heading and every tier description as one block
+    choices: tuple  # 0 ("Not started") plus each described tier
+    labels: MappingProxyType
+
+
+def onboarding_layout(milestones):
+    # Built once per catalog from the milestone descriptions, in CSV order;
+    # categories without any described tier are left out of the form
+    layout = []
+    for category, descriptions in milestones.items():
+        if not descriptions:
+            continue
+        tiers = sorted(descriptions)
+        lines = [f"---\n### {category}", *(f"**Tier {tier}:** {descriptions[tier].strip()}" for tier in tiers)]
+        layout.append(OnboardingCategory(
+            category,
+            "\n\n".join(lines),
+            (0, *tiers),
+            MappingProxyType({0: "0: Not started", **{tier: f"{tier}: Tier {tier}" for tier in tiers}}),
+        ))
+    return tuple(layout)
+
+
+# ------------------ Loaded Catalogs ------------------ #
+class Catalog(NamedTuple):
+    framework: Framework
+    index: object
+    templates: ReportTemplates
+    onboarding: tuple
+    search: TaskSearch
+
+
+@lru_cache(maxsize=MAX_LOADED_FRAMEWORKS)
+def get_catalog(name=DEFAULT_FRAMEWORK):
+    # Loaded and indexed on first use; sessions already holding an evicted catalog keep
+    # their reference, and the next lookup simply rebuilds it
+    framework = FRAMEWORKS.get(name) or FRAMEWORKS[DEFAULT_FRAMEWORK]
+    templates = load_report_templates(framework.milestones_file)
+    index = load_roadmap_index(framework.roadmap_file)
+    return Catalog(framework, index, templates, onboarding_layout(templates.milestones), TaskSearch(index))
@@ -1,31 +1,130 @@
+import argparse
 import csv
+import hashlib
+import io
 import json
+import sys
 
+from roadmap_engine import TIERS, Task, compiled_path, read_compiled_catalog, write_compiled_catalog
 
 # Input and output file paths
 csv_file = "SOC 2 to NIST Privacy Framework - Roadmap.csv"
 json_file = "roadmap_data.json"
 
-output = []
+REQUIRED_COLUMNS = (
+    "Category",
+    "Item",
+    "Tier",
+    "Responsible Role",
+    "Only Applicable if Third Party Collection Exists",
+    "Only Applicable if Third Party Disclosure Related",
+    "Relevant to ",
+)
+KNOWN_ROLES = {"Executive Level", "Process Manager", "Process Manager Level", "Operations Level"}
+KNOWN_TYPES = {"Controller", "Processor", "Controller & Processor"}
+BOOLEAN_VALUES = {"TRUE": True, "FALSE": False}
 
-with open(csv_file, mode='r', encoding='utf-8-sig') as file:
-    reader = csv.DictReader(file)
+
+# ------------------ Validation ------------------ #
+def parse_rows(reader):
+    # Returns (tasks, errors); every problem is reported, not just the first one
+    missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or [])]
+    if missing:
+        return [], [f"missing column(s): {', '.join(repr(c) for c in missing)}"]
+
+    output, errors = [], []
     for index, row in enumerate(reader, start=1):
-        task = {
+        line = f"row {index + 1}"  # +1 for the header line
+        row_errors = []
+        tier = row["Tier"].strip()
+        if not tier.isdigit() or int(tier) not in TIERS:
+            row_errors.append(f"{line}: tier {tier!r} is not one of {list(TIERS)}")
+        roles = [part.strip() for part in row["Responsible Role"].split("&")]
+        if not all(role in KNOWN_ROLES for role in roles):
+            row_errors.append(f"{line}: unknown responsible role {row['Responsible Role'].strip()!r}")
+        if row["Relevant to "].strip() not in KNOWN_TYPES:
+            row_errors.append(f"{line}: unknown controller/processor type {row['Relevant to '].strip()!r}")
+        flags = {}
+        for key, column in (
+            ("third_party_collection", "Only Applicable if Third Party Collection Exists"),
+            ("third_party_disclosure", "Only Applicable if Third Party Disclosure Related"),
+        ):
+            value = row[column].strip().upper()
+            if value not in BOOLEAN_VALUES:
+                row_errors.append(f"{line}: {column!r} must be TRUE or FALSE, got {row[column]!r}")
+            flags[key] = BOOLEAN_VALUES.get(value, False)
+        if not row["Category"].strip() or not row["Item"].strip():
+            row_errors.append(f"{line}: category and item must not be empty")
+        if row_errors:
+            errors.extend(row_errors)
+            continue
+
+        output.append({
             "id": f"T{index:03}",  # e.g., T001, T002
             "category": row["Category"].strip(),
             "task": row["Item"].strip(),
-            "tier": int(row["Tier"]),
+            "tier": int(tier),
             "role": row["Responsible Role"].strip(),
             "type": row["Relevant to "].strip(),
-            "third_party_collection": row["Only Applicable if Third Party Collection Exists"].strip().upper() == "TRUE",
-            "third_party_disclosure": row["Only Applicable if Third Party Disclosure Related"].strip().upper() == "TRUE",
+            **flags,
             "done": False
-        }
-        output.append(task)
+        })
+    return output, errors
+
+
+# ------------------ Build ------------------ #
+def build(force=False):
+    try:
+        with open(csv_file, mode='rb') as file:
+            source = file.read()
+    except FileNotFoundError:
+        print(f"❌ {csv_file} not found", file=sys.stderr)
+        return 1
+    source_sha256 = hashlib.sha256(source).hexdigest()
+
+    # Skip the rebuild when the CSV is unchanged and both artifacts are in place
+    compiled = read_compiled_catalog(compiled_path(json_file))
+    if not force and compiled is not None and compiled.get("source_sha256") == source_sha256:
+        try:
+            with open(json_file, mode='rb') as file:
+                current_json = hashlib.sha256(file.read()).hexdigest()
+        except OSError:
+            current_json = None
+        if current_json == compiled["json_sha256"]:
+            print(f"✅ {csv_file} unchanged; {json_file} is up to date")
+            return 0
+
+    reader = csv.DictReader(io.StringIO(source.decode('utf-8-sig'), newline=''))
+    output, errors = parse_rows(reader)
+    if errors:
+        print(f"❌ {csv_file} failed validation:", file=sys.stderr)
+        for error in errors:
+            print(f"  - {error}", file=sys.stderr)
+        return 1
+
+    # Write to JSON (kept human-readable for review) and the compact compiled catalog
+    data = json.dumps(output, indent=2).encode('utf-8')
+    with open(json_file, mode='wb') as file:
+        file.write(data)
+    write_compiled_catalog(
+        [Task.from_dict(row) for row in output],
+        hashlib.sha256(data).hexdigest(),
+        compiled_path(json_file),
+        source_sha256,
+    )
+
+    print(f"✅ Successfully converted to {json_file} and {compiled_path(json_file)}")
+    return 0
+
 
-# Write to JSON
-with open(json_file, mode='w', encoding='utf-8') as file:
-    json.dump(output, file, indent=2)
+if __name__ == "__main__":
+    from catalogs import DEFAULT_FRAMEWORK, FRAMEWORKS
 
-print(f"✅ Successfully converted to {json_file}")
+    parser = argparse.ArgumentParser(description="Validate the roadmap CSV and compile it for the app.")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the CSV has not changed")
+    parser.add_argument("--framework", choices=list(FRAMEWORKS), default=DEFAULT_FRAMEWORK,
+                        help="which registered framework's roadmap CSV to convert")
+    args = parser.parse_args()
+    csv_file = FRAMEWORKS[args.framework].roadmap_csv
+    json_file = FRAMEWORKS[args.framework].roadmap_file
+    sys.exit(build(force=args.force))
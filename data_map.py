@@ -0,0 +1,65 @@
+import base64
+from io import BytesIO
+from typing import NamedTuple
+
+# Long edge in pixels: about a full A4/Letter page width at 200 dpi
+MAX_PRINT_PIXELS = 1600
+
+MIME_TYPES = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "svg": "image/svg+xml",
+}
+
+
+# ------------------ Ingested Data Map ------------------ #
+class DataMapImage(NamedTuple):
+    # Compact print-resolution bytes, their real MIME type, and the base64 form
+    # encoded once at upload so every export reuses it
+    name: str
+    data: bytes
+    mime: str
+    base64: str
+
+    def display_data(self):
+        # st.image opens raw bytes with PIL, which cannot read SVG; markup is passed as text
+        return self.data.decode("utf-8") if self.mime == "image/svg+xml" else self.data
+
+    def html(self, alt="Data Map"):
+        return f'<img src="data:{self.mime};base64,{self.base64}" alt="{alt}"/>'
+
+
+def _downscale(raw, mime):
+    from PIL import Image
+
+    try:
+        with Image.open(BytesIO(raw)) as image:
+            if max(image.size) <= MAX_PRINT_PIXELS:
+                return raw, mime
+            # JPEG can decode straight at a reduced scale, skipping most of the full-size work
+            image.draft("RGB", (MAX_PRINT_PIXELS, MAX_PRINT_PIXELS))
+            image.thumbnail((MAX_PRINT_PIXELS, MAX_PRINT_PIXELS))
+            out = BytesIO()
+            if mime == "image/jpeg":
+                image.convert("RGB").save(out, format="JPEG", quality=85, optimize=True)
+            else:
+                image.save(out, format="PNG", optimize=True)
+                mime = "image/png"
+            return out.getvalue(), mime
+    except OSError as e:  # PIL.UnidentifiedImageError, or a truncated file
+        raise ValueError(f"{mime} image could not be read") from e
+
+
+def ingest_data_map(uploaded_file):
+    # Reads the upload exactly once; raster images larger than print size are downsampled.
+    # Raises ValueError if the upload cannot be read as the image type it claims to be.
+    raw = uploaded_file.getvalue()
+    extension = uploaded_file.name.rsplit(".", 1)[-1].lower()
+    mime = MIME_TYPES.get(extension, uploaded_file.type or "image/png")
+    data = raw
+    if mime == "image/svg+xml":
+        raw.decode("utf-8")  # UnicodeDecodeError (a ValueError) if it is not SVG text
+    else:
+        data, mime = _downscale(raw, mime)
+    return DataMapImage(uploaded_file.name, data, mime, base64.b64encode(data).decode())
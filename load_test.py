@@ -0,0 +1,201 @@
+import argparse
+import gc
+import json
+import os
+import resource
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from streamlit.testing.v1 import AppTest
+
+from org_session import PROGRESS_KEYS
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+USERS = 10
+TICK_ROUNDS = 3
+TICKS_PER_ROUND = 5
+PDF_TIMEOUT = 120  # seconds to wait for an export before counting it as failed
+TIMEOUT = 60  # per script run
+# AppTest swaps process-global runtime state on every run, so script runs from different
+# simulated users cannot overlap; they queue here instead. A real server's reruns contend
+# for the GIL in much the same way, and the time spent queued counts toward latency.
+RUN_LOCK = threading.Lock()
+# Session keys the app owns; widget keys are left behind, as on a real page switch
+SESSION_KEYS = (
+    *PROGRESS_KEYS, "framework", "organization", "hydrated_org",
+    "data_map_image", "data_map_upload_id", "pdf_job", "pdf_job_started",
+)
+
+
+# ------------------ Simulated Session ------------------ #
+class Session:
+    # One user's journey; every script run is timed and tagged with its step
+    def __init__(self, number, think=0.0):
+        self.number = number
+        self.think = think  # pause after each rerun, like a user reading the page
+        self.state = {}
+        self.timings = []  # (step, latency seconds, service seconds)
+        self.errors = []
+        self.app = None
+
+    def open(self, script):
+        if self.app is not None:
+            self.state.update(
+                (key, self.app.session_state[key]) for key in SESSION_KEYS if key in self.app.session_state
+            )
+        self.app = AppTest.from_file(os.path.join(ROOT, script), default_timeout=TIMEOUT)
+        for key, value in self.state.items():
+            self.app.session_state[key] = value
+        return self.run(f"open {script}")
+
+    def run(self, step, action=None):
+        requested = time.perf_counter()
+        with RUN_LOCK:
+            start = time.perf_counter()
+            (action or self.app).run()
+            done = time.perf_counter()
+        self.timings.append((step, done - requested, done - start))
+        if self.think:
+            time.sleep(self.think)
+        if self.app.exception:
+            self.errors.append(f"{step}: {self.app.exception[0].message}")
+        return self.app
+
+    def journey(self, pdf=True):
+        app = self.open("main.py")
+
+        # Onboarding: each user claims a different starting tier per category
+        app = self.open("Pages/1_Onboarding.py")
+        for i, box in enumerate(b for b in app.selectbox if b.label != "Framework"):
+            label = box.options[(self.number + i) % len(box.options)]  # "2: Tier 2"
+            box.set_value(int(label.split(":")[0]))
+        self.run("onboarding submit", app.button[0].click())
+
+        app = self.open("Pages/2_Tier_Profile_and_Questions.py")
+        self.run("questions submit", app.button[0].click())
+
+        app = self.open("Pages/3_Roadmap.py")
+        for _ in range(TICK_ROUNDS):
+            if not app.checkbox:
+                break
+            for box in app.checkbox[:TICKS_PER_ROUND]:
+                box.check()
+            self.run("roadmap save", app.button[0].click())
+
+        app = self.open("Pages/4_Profile.py")
+        if pdf:
+            self.run("pdf export", app.button[0].click())
+            deadline = time.monotonic() + PDF_TIMEOUT
+            while not app.get("download_button") and not app.error:
+                if time.monotonic() > deadline:
+                    self.errors.append("pdf export: timed out")
+                    break
+                time.sleep(0.25)
+                self.run("pdf poll")
+        return self
+
+
+# ------------------ Reporting ------------------ #
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def latency_summary(samples):
+    return {
+        "runs": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 1),
+        "p95_ms": round(percentile(samples, 95) * 1000, 1),
+        "p99_ms": round(percentile(samples, 99) * 1000, 1),
+        "mean_ms": round(statistics.mean(samples) * 1000, 1),
+    }
+
+
+def session_memory(sessions, pdf):
+    # Memory a session keeps alive between reruns: its session state after a full journey.
+    # Runs sequentially under tracemalloc, after the shared catalogs are already loaded.
+    tracemalloc.start()
+    sizes = []
+    try:
+        for number in range(sessions):
+            gc.collect()
+            before = tracemalloc.get_traced_memory()[0]
+            session = Session(number).journey(pdf)
+            state = dict(session.state)
+            state.update((k, session.app.session_state[k]) for k in SESSION_KEYS if k in session.app.session_state)
+            del session
+            gc.collect()
+            sizes.append(tracemalloc.get_traced_memory()[0] - before)
+            del state
+    finally:
+        tracemalloc.stop()
+    return {
+        "sessions": sessions,
+        "mean_kib": round(statistics.mean(sizes) / 1024, 1),
+        "max_kib": round(max(sizes) / 1024, 1),
+    }
+
+
+def load_test(users=USERS, pdf=True, memory_sessions=3, think=0.0):
+    # Warm-up journey so every run measures a server that has already loaded its catalogs
+    Session(-1).journey(pdf=False)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(users) as executor:
+        sessions = list(executor.map(lambda n: Session(n, think).journey(pdf), range(users)))
+    wall = time.perf_counter() - started
+
+    by_step = defaultdict(list)
+    for session in sessions:
+        for step, latency, _ in session.timings:
+            by_step[step].append(latency)
+    timings = [timing for session in sessions for timing in session.timings]
+    return {
+        "users": users,
+        "wall_seconds": round(wall, 2),
+        "rerun_latency": latency_summary([latency for _, latency, _ in timings]),
+        "rerun_service": latency_summary([service for _, _, service in timings]),
+        "steps": {step: latency_summary(samples) for step, samples in sorted(by_step.items())},
+        "errors": [f"user {s.number}: {e}" for s in sessions for e in s.errors],
+        "session_memory": session_memory(memory_sessions, pdf) if memory_sessions else None,
+        "max_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate concurrent user sessions with Streamlit's AppTest runner.")
+    parser.add_argument("--users", type=int, nargs="+", default=[USERS], help="concurrent sessions (several values = a sweep)")
+    parser.add_argument("--no-pdf", action="store_true", help="skip the PDF export step")
+    parser.add_argument("--think", type=float, default=0.0, help="seconds each user pauses after a rerun")
+    parser.add_argument("--memory-sessions", type=int, default=3, help="sessions to measure memory on (0 to skip)")
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # the pages open their data files relative to the app folder
+    results = []
+    for users in args.users:
+        result = load_test(users, pdf=not args.no_pdf, memory_sessions=args.memory_sessions, think=args.think)
+        results.append(result)
+        latency, service = result["rerun_latency"], result["rerun_service"]
+        print(
+            f"{users:>4} users  p50 {latency['p50_ms']:>8.1f} ms  p95 {latency['p95_ms']:>8.1f} ms  "
+            f"p99 {latency['p99_ms']:>8.1f} ms  (service p95 {service['p95_ms']:.1f} ms)  errors {len(result['errors'])}",
+            flush=True,
+        )
+        for step, summary in result["steps"].items():
+            print(f"        {step:<44} p50 {summary['p50_ms']:>8.1f} ms  p95 {summary['p95_ms']:>8.1f} ms  ({summary['runs']} runs)")
+        if result["session_memory"]:
+            print(f"        session state ≈ {result['session_memory']['mean_kib']} KiB per session "
+                  f"(max {result['session_memory']['max_kib']} KiB); peak RSS {result['max_rss_mib']} MiB")
+        for error in result["errors"][:10]:
+            print(f"        ❌ {error}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    sys.exit(1 if any(r["errors"] for r in results) else 0)
@@ -1,6 +1,8 @@
 import streamlit as st
+from org_session import sync_organization
 
 st.set_page_config(page_title="Privacy Roadmap App", layout="wide")
+sync_organization()
 
 st.title("Welcome to Your Privacy Program App")
 st.markdown("""
@@ -8,4 +10,7 @@ Use the sidebar to navigate through the app:
 - Onboarding
 - Tier Profile & Questions
 - Roadmap (next page)
+- Portfolio (tier status across every saved organization)
+
+Enter your organization's name in the sidebar to save your progress and pick it up again later.
 """)
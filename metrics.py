@@ -0,0 +1,170 @@
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from functools import lru_cache
+
+METRICS_FILE = "app_metrics.prom"
+WRITE_INTERVAL = 10  # seconds between rewrites of the Prometheus text file
+RECENT_SAMPLES = 500  # per page/phase, for the admin panel's percentiles
+# Histogram bucket bounds in seconds, as Prometheus expects
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+# ------------------ Process-wide Registry ------------------ #
+class Metrics:
+    # Shared by every session in the server process; Streamlit runs each session's
+    # script on its own thread, hence the lock.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.phase_count = defaultdict(int)
+        self.phase_sum = defaultdict(float)
+        self.phase_buckets = defaultdict(lambda: [0] * len(BUCKETS))
+        self.recent = defaultdict(lambda: deque(maxlen=RECENT_SAMPLES))
+        self._written_at = 0.0
+
+    def observe(self, page, phase, seconds):
+        key = (page, phase)
+        with self._lock:
+            self.phase_count[key] += 1
+            self.phase_sum[key] += seconds
+            buckets = self.phase_buckets[key]
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    buckets[i] += 1
+            self.recent[key].append(seconds)
+
+    # ------------------ Snapshots ------------------ #
+    def phase_rows(self):
+        with self._lock:
+            snapshot = {key: sorted(samples) for key, samples in self.recent.items()}
+            counts = dict(self.phase_count)
+            sums = dict(self.phase_sum)
+        rows = []
+        for (page, phase), samples in sorted(snapshot.items()):
+            rows.append({
+                "page": page,
+                "phase": phase,
+                "reruns": counts[(page, phase)],
+                "mean ms": round(sums[(page, phase)] / counts[(page, phase)] * 1000, 1),
+                "p50 ms": round(samples[len(samples) // 2] * 1000, 1),
+                "p95 ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 1),
+            })
+        return rows
+
+    def cache_rows(self):
+        # The process-wide lru_cache loaders, plus the PDF job cache
+        from catalogs import get_catalog
+        from pdf_export import get_pdf_jobs
+        from storage import get_progress_store
+
+        stats = {}
+        for loader in (get_catalog, get_progress_store, get_pdf_jobs):
+            info = loader.cache_info()
+            stats[loader.__name__] = (info.hits, info.misses)
+        if get_pdf_jobs.cache_info().currsize:
+            jobs = get_pdf_jobs()
+            stats["pdf_jobs"] = (jobs.hits, jobs.misses)
+        return [{"loader": loader, "hits": hits, "misses": misses} for loader, (hits, misses) in sorted(stats.items())]
+
+    # ------------------ Prometheus Text Format ------------------ #
+    def prometheus_text(self):
+        lines = [
+            "# HELP privacy_app_phase_seconds Page script phase duration per rerun.",
+            "# TYPE privacy_app_phase_seconds histogram",
+        ]
+        with self._lock:
+            keys = sorted(self.phase_count)
+            for page, phase in keys:
+                labels = f'page="{page}",phase="{phase}"'
+                for bound, count in zip(BUCKETS, self.phase_buckets[(page, phase)]):
+                    lines.append(f'privacy_app_phase_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'privacy_app_phase_seconds_bucket{{{labels},le="+Inf"}} {self.phase_count[(page, phase)]}')
+                lines.append(f"privacy_app_phase_seconds_sum{{{labels}}} {self.phase_sum[(page, phase)]:.6f}")
+                lines.append(f"privacy_app_phase_seconds_count{{{labels}}} {self.phase_count[(page, phase)]}")
+        rows = self.cache_rows()
+        for column, help_text in (("hits", "Loader calls served from cache."), ("misses", "Loader calls that had to load.")):
+            lines.append(f"# HELP privacy_app_cache_{column}_total {help_text}")
+            lines.append(f"# TYPE privacy_app_cache_{column}_total counter")
+            lines.extend(f'privacy_app_cache_{column}_total{{loader="{row["loader"]}"}} {row[column]}' for row in rows)
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path=METRICS_FILE, force=False):
+        # Throttled so busy servers rewrite the file at most every WRITE_INTERVAL seconds
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._written_at < WRITE_INTERVAL:
+                return
+            self._written_at = now
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.prometheus_text())
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # metrics must never break a page
+
+
+@lru_cache(maxsize=None)
+def get_metrics():
+    return Metrics()
+
+
+# ------------------ Page Reruns ------------------ #
+class PageRun:
+    # Times consecutive phases of one page script run: each phase() call closes the
+    # previous phase, and finish() (or stop()) closes the last one and the rerun.
+    def __init__(self, page):
+        self.page = page
+        self.started = self._mark = time.perf_counter()
+        self._phase = "setup"
+        self._finished = False
+
+    def phase(self, name):
+        now = time.perf_counter()
+        get_metrics().observe(self.page, self._phase, now - self._mark)
+        self._phase, self._mark = name, now
+
+    def finish(self):
+        if self._finished:
+            return
+        self._finished = True
+        now = time.perf_counter()
+        metrics = get_metrics()
+        metrics.observe(self.page, self._phase, now - self._mark)
+        metrics.observe(self.page, "total", now - self.started)
+        metrics.write_prometheus()
+        show_admin_panel()
+
+    def stop(self):
+        import streamlit as st
+
+        self.finish()
+        st.stop()
+
+
+def start_rerun(page):
+    return PageRun(page)
+
+
+# ------------------ Admin Panel ------------------ #
+def show_admin_panel():
+    # Opt-in per browser tab with ?admin=1 in the URL
+    import streamlit as st
+
+    if st.query_params.get("admin") != "1":
+        return
+    metrics = get_metrics()
+    with st.sidebar.expander("📈 Performance", expanded=True):
+        st.caption("Phase timings per page (this server process)")
+        st.dataframe(metrics.phase_rows(), hide_index=True)
+        st.caption("Cache hits and misses per loader")
+        st.dataframe(metrics.cache_rows(), hide_index=True)
+        from warmup import STARTUP_REPORT
+
+        if STARTUP_REPORT:
+            st.caption("Server warm-up")
+            st.dataframe([{"step": step, "ms": round(ms, 1)} for step, ms in STARTUP_REPORT], hide_index=True)
+        if st.button("Write metrics file now"):
+            metrics.write_prometheus(force=True)
+            st.success(f"Wrote {METRICS_FILE}")
@@ -0,0 +1,91 @@
+import streamlit as st
+
+from catalogs import DEFAULT_FRAMEWORK, available_frameworks, get_catalog
+from storage import get_progress_store
+
+PROGRESS_KEYS = ("completed_mask", "questions", "overall_tier", "progress_tracker")
+
+
+# ------------------ Organization and Hydration ------------------ #
+def sync_organization():
+    # The organization name lives in a plain session key (widget state does not survive
+    # page switches) and in the URL, so a reconnect restores the same program.
+    current = st.session_state.get("organization") or st.query_params.get("org", "")
+    org = st.sidebar.text_input("Organization", value=current, help="Progress is saved under this name.").strip()
+
+    if org != st.session_state.get("organization"):
+        st.session_state["organization"] = org
+        st.session_state.pop("hydrated_org", None)
+        if org:
+            st.query_params["org"] = org
+        else:
+            st.query_params.pop("org", None)
+
+    if org and st.session_state.get("hydrated_org") != org:
+        hydrate_session(org)
+    return org
+
+
+def hydrate_session(org):
+    # Runs once per organization per session, not on every rerun
+    store = get_progress_store()
+    saved = store.load(org)
+    if saved is None:
+        # New organization: keep what this session has entered so far
+        store.save_framework(org, current_framework())
+        if "completed_mask" in st.session_state:
+            store.replace_completed(org, current_catalog().index.mask_to_ids(st.session_state["completed_mask"]))
+        if "questions" in st.session_state:
+            store.save_questions(org, st.session_state["questions"], st.session_state.get("overall_tier"))
+    else:
+        framework, questions, completed = saved
+        for key in PROGRESS_KEYS:
+            st.session_state.pop(key, None)
+        st.session_state["framework"] = framework or DEFAULT_FRAMEWORK
+        # Ids are only materialized at the storage boundary; the session keeps one bitmap
+        st.session_state["completed_mask"] = current_catalog().index.ids_to_mask(completed)
+        if questions is not None:
+            st.session_state["questions"] = questions
+    st.session_state["hydrated_org"] = org
+
+
+# ------------------ Framework Selection ------------------ #
+def current_framework():
+    framework = st.session_state.get("framework", DEFAULT_FRAMEWORK)
+    return framework if framework in available_frameworks() else DEFAULT_FRAMEWORK
+
+
+def current_catalog():
+    # Only the session's own framework is ever loaded
+    return get_catalog(current_framework())
+
+
+def select_framework(framework):
+    # Task ids belong to one catalog, so a different framework starts from a clean slate
+    if framework == current_framework():
+        return
+    for key in PROGRESS_KEYS:
+        st.session_state.pop(key, None)
+    st.session_state["framework"] = framework
+    org = st.session_state.get("organization")
+    if org:
+        get_progress_store().save_framework(org, framework)
+
+
+# ------------------ Write-through ------------------ #
+def persist_completed(task_ids, replace=False, role=None):
+    # Also appends to the organization's progress event log (see storage.ProgressStore)
+    org = st.session_state.get("organization")
+    if not org:
+        return
+    store = get_progress_store()
+    if replace:
+        store.replace_completed(org, task_ids)
+    else:
+        store.add_completed(org, task_ids, role)
+
+
+def persist_questions(questions, overall_tier=None):
+    org = st.session_state.get("organization")
+    if org:
+        get_progress_store().save_questions(org, questions, overall_tier)
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from io import BytesIO
+
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+CACHE_SIZE = 64
+# Metrics label for render times; the Profile page is the only one that exports
+METRICS_PAGE = "Profile"
+
+
+# ------------------ Rendering (runs in a worker process) ------------------ #
+def html_to_pdf(html_content):
+    from xhtml2pdf import pisa
+
+    pdf = BytesIO()
+    pisa.CreatePDF(BytesIO(html_content.encode("utf-8")), dest=pdf)
+    return pdf.getvalue()
+
+
+def report_key(completed_bytes, questions, category_tiers, data_map_bytes=b"", framework="", as_of=""):
+    # Everything that can change the report; identical inputs share one cached PDF
+    digest = hashlib.sha256()
+    digest.update(json.dumps([framework, questions, category_tiers, as_of], sort_keys=True).encode("utf-8"))
+    digest.update(completed_bytes)
+    digest.update(data_map_bytes or b"")
+    return digest.hexdigest()
+
+
+# ------------------ Job Pool and Result Cache ------------------ #
+class PdfJobs:
+    # Bounded process pool (pisa is pure Python, so threads would serialize on the GIL)
+    # plus an LRU cache of futures keyed by report_key(); a repeated or concurrent
+    # request for the same report reuses the running or finished job.
+    def __init__(self, max_workers=MAX_WORKERS, cache_size=CACHE_SIZE):
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self._executor = None
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _pool(self):
+        if self._executor is None:
+            # fork, not spawn: Streamlit installs the running page script as __main__,
+            # which spawned workers would re-execute on start-up
+            self._executor = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("fork"))
+        return self._executor
+
+    def warm_up(self):
+        # Import the renderer (about a second) before the workers fork so each inherits
+        # it, then start them; the first export no longer pays for either
+        import xhtml2pdf.pisa  # noqa: F401
+
+        with self._lock:
+            self._pool().submit(int).result()
+
+    def submit(self, key, build_html):
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and not (job.done() and job.exception() is not None):
+                self._jobs.move_to_end(key)
+                self.hits += 1
+                return job
+            self.misses += 1
+            html = build_html()
+            try:
+                job = self._pool().submit(html_to_pdf, html)
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory); start a fresh pool
+                self._executor = None
+                job = self._pool().submit(html_to_pdf, html)
+            job.add_done_callback(self._record_render(time.perf_counter()))
+            self._jobs[key] = job
+            self._evict()
+            return job
+
+    @staticmethod
+    def _record_render(submitted):
+        # Observed when the worker finishes: queueing plus rendering, as the user waits for it
+        def record(job):
+            from metrics import get_metrics
+
+            get_metrics().observe(METRICS_PAGE, "pdf_render", time.perf_counter() - submitted)
+        return record
+
+    def get(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def _evict(self):
+        # Drop the least recently used finished jobs; running jobs are never evicted
+        for key in list(self._jobs):
+            if len(self._jobs) <= self.cache_size:
+                break
+            if self._jobs[key].done():
+                del self._jobs[key]
+
+
+@lru_cache(maxsize=None)
+def get_pdf_jobs():
+    return PdfJobs()
@@ -0,0 +1,104 @@
+from typing import NamedTuple
+
+from roadmap_engine import ROLE_FILTERS, TIERS, mask_count, mask_positions
+
+# Tasks listed per role before the rest are summarized as "+N more"
+PLAN_PREVIEW = 10
+
+
+# ------------------ Next-Tier Plan ------------------ #
+class TierGoal(NamedTuple):
+    category: str  # None for the overall tier
+    current_tier: int
+    target_tier: int
+    mask: int  # outstanding applicable tasks that stand between the two
+
+    @property
+    def count(self):
+        return mask_count(self.mask)
+
+
+class PlannedTask(NamedTuple):
+    task: object
+    unlocks: int  # tier goals this task counts toward (its category's and/or the overall one)
+
+
+class Plan(NamedTuple):
+    overall: TierGoal  # None once Tier 4 is reached or the next tier has no applicable task
+    categories: tuple  # TierGoal per category, fewest tasks to go first
+    tasks: tuple  # PlannedTask, most unlocks first, then the categories closest to their next tier
+    by_role: dict  # role filter label -> PlannedTask in the same order
+    mask: int  # every task on the plan
+
+
+def plan_next_tiers(index, completed_mask, applicable_mask, category_tiers, overall_tier, targets=None):
+    # A tier counts once every applicable task in it and below is complete, and the current
+    # tier says everything below is, so the shortest path to the next tier is exactly the
+    # outstanding applicable tasks of that one (category, tier) bucket: a few mask
+    # operations per category, cheap enough to recompute on every rerun.
+    outstanding = applicable_mask & ~completed_mask
+    targets = targets or {}
+
+    goals = []
+    for category in index.categories:
+        current = category_tiers.get(category, 0)
+        target = current + 1
+        if target > min(targets.get(category, TIERS[-1]), TIERS[-1]):
+            continue
+        mask = index.category_tier_masks.get((category, target), 0) & outstanding
+        if mask:  # an empty bucket stops the climb, so that tier cannot be planned for
+            goals.append(TierGoal(category, current, target, mask))
+    goals.sort(key=lambda goal: (goal.count, goal.category))
+
+    # The overall tier is judged over every applicable task, whatever the category targets
+    overall = None
+    if overall_tier < TIERS[-1]:
+        mask = index.tier_masks.get(overall_tier + 1, 0) & outstanding
+        if mask:
+            overall = TierGoal(None, overall_tier, overall_tier + 1, mask)
+
+    plan_mask = overall.mask if overall else 0
+    for goal in goals:
+        plan_mask |= goal.mask
+
+    # Every planned task is outstanding and applicable, so it belongs to a goal exactly when
+    # its tier is that goal's target; one pass over the plan's positions ranks them all
+    goal_ranks = {goal.category: (rank, goal.target_tier) for rank, goal in enumerate(goals)}
+    overall_target = overall.target_tier if overall else None
+    planned = []
+    for pos in mask_positions(plan_mask):
+        task = index.tasks[pos]
+        rank, target = goal_ranks.get(task.category, (len(goals), None))
+        in_category = task.tier == target
+        unlocks = in_category + (task.tier == overall_target)
+        planned.append((-unlocks, rank if in_category else len(goals), task.tier, pos, unlocks))
+    planned.sort()
+    tasks = tuple(PlannedTask(index.tasks[pos], unlocks) for *_, pos, unlocks in planned)
+
+    by_role = {}
+    for label in ROLE_FILTERS:
+        in_role = set(mask_positions(index.role_mask(label) & plan_mask))
+        if in_role:
+            by_role[label] = [p for p, (*_, pos, _) in zip(tasks, planned) if pos in in_role]
+    return Plan(overall, tuple(goals), tasks, by_role, plan_mask)
+
+
+# ------------------ Display ------------------ #
+def show_plan(plan, preview=PLAN_PREVIEW):
+    # Shared by the Roadmap and Profile pages: the ranked plan, one tab per responsible role
+    import streamlit as st
+
+    if not plan.tasks:
+        st.success("🎉 Nothing stands between you and your target tiers.")
+        return
+    goals = [f"Overall → Tier {plan.overall.target_tier} ({plan.overall.count} tasks)"] if plan.overall else []
+    goals += [f"{g.category} → Tier {g.target_tier} ({g.count})" for g in plan.categories]
+    st.caption("Next tiers within reach: " + " · ".join(goals))
+    tabs = st.tabs([f"{role} ({len(tasks)})" for role, tasks in plan.by_role.items()])
+    for tab, tasks in zip(tabs, plan.by_role.values()):
+        with tab:
+            for planned in tasks[:preview]:
+                badge = " ⭐ also unlocks the next overall tier" if planned.unlocks > 1 else ""
+                st.markdown(f"- **{planned.task.category} · Tier {planned.task.tier}:** {planned.task.task}{badge}")
+            if len(tasks) > preview:
+                st.caption(f"+{len(tasks) - preview} more")
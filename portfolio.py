@@ -0,0 +1,149 @@
+import heapq
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import NamedTuple
+
+from catalogs import DEFAULT_FRAMEWORK, MAX_LOADED_FRAMEWORKS, get_catalog
+from roadmap_engine import TIERS, mask_count, mask_positions
+from storage import get_progress_store
+
+# Saves committed slightly out of timestamp order are caught by re-reading this window
+REFRESH_OVERLAP = 1.0  # seconds
+TOP_OUTSTANDING = 15
+
+
+# ------------------ Completion Matrix ------------------ #
+class OrgRow(NamedTuple):
+    # One organization's row of the organizations x tasks matrix, with its derived tiers
+    updated_at: float
+    completed_mask: int
+    remaining_mask: int  # applicable to its setup answers and not yet completed
+    overall_tier: int
+    category_tiers: dict
+    category_progress: dict  # category -> (completed, applicable)
+
+
+class Portfolio:
+    # Materialized aggregates over every organization on one framework. Each organization
+    # is a bitmap row; the summaries are counters that a row change adjusts by its delta,
+    # so a refresh costs only the organizations saved since the previous one, and the
+    # dashboard reads a precomputed summary. Shared by all sessions, hence the lock.
+    def __init__(self, catalog, store):
+        self.catalog = catalog
+        self.store = store
+        index = catalog.index
+        self.rows = {}
+        self.tier_counts = Counter()
+        self.category_tier_counts = {category: Counter() for category in index.categories}
+        self.category_done = Counter()
+        self.category_applicable = Counter()
+        self.outstanding = [0] * len(index.tasks)  # organizations still missing each task
+        self._seen = {}  # org -> updated_at last read, on any framework
+        self._watermark = float("-inf")
+        self._summary = None
+        self._lock = threading.Lock()
+
+    def _row(self, questions, completed_ids, updated_at):
+        index = self.catalog.index
+        completed = index.ids_to_mask(completed_ids)
+        applicable = index.applicable_mask(questions)
+        overall_tier, category_tiers = index.evaluate_tiers(completed, applicable)
+        done = completed & applicable
+        progress = {
+            category: (mask_count(done & mask), mask_count(applicable & mask))
+            for category, mask in index.category_masks.items()
+        }
+        return OrgRow(updated_at, completed, applicable & ~completed, overall_tier, category_tiers, progress)
+
+    def _apply(self, row, sign):
+        self.tier_counts[row.overall_tier] += sign
+        for category, tier in row.category_tiers.items():
+            self.category_tier_counts[category][tier] += sign
+        for category, (done, applicable) in row.category_progress.items():
+            self.category_done[category] += sign * done
+            self.category_applicable[category] += sign * applicable
+
+    def _replace(self, org, new):
+        old = self.rows.pop(org, None)
+        old_remaining = 0
+        if old is not None:
+            self._apply(old, -1)
+            old_remaining = old.remaining_mask
+        new_remaining = 0
+        if new is not None:
+            self._apply(new, 1)
+            self.rows[org] = new
+            new_remaining = new.remaining_mask
+        # Only the tasks whose outstanding state flipped touch the per-task counters
+        changed = old_remaining ^ new_remaining
+        for pos in mask_positions(changed & new_remaining):
+            self.outstanding[pos] += 1
+        for pos in mask_positions(changed & old_remaining):
+            self.outstanding[pos] -= 1
+        self._summary = None
+
+    def refresh(self):
+        # Pull every organization saved since the last refresh; returns how many rows changed
+        name = self.catalog.framework.name
+        with self._lock:
+            changed = 0
+            newest = self._watermark
+            stale = []
+            for org, updated_at in self.store.saved_since(self._watermark - REFRESH_OVERLAP):
+                newest = max(newest, updated_at)
+                if self._seen.get(org) != updated_at:
+                    stale.append(org)
+            for org, framework, questions, updated_at, completed in self.store.load_many(stale):
+                self._seen[org] = updated_at
+                if (framework or DEFAULT_FRAMEWORK) != name:
+                    if org in self.rows:  # switched to another framework
+                        self._replace(org, None)
+                        changed += 1
+                    continue
+                self._replace(org, self._row(questions, completed, updated_at))
+                changed += 1
+            self._watermark = newest
+            return changed
+
+    def summary(self):
+        # Rebuilt from the counters only after a change; otherwise the same snapshot is served
+        with self._lock:
+            if self._summary is None:
+                self._summary = self._build_summary()
+            return self._summary
+
+    def _build_summary(self):
+        index = self.catalog.index
+        organizations = len(self.rows)
+        categories = []
+        for category in index.categories:
+            applicable = self.category_applicable[category]
+            categories.append({
+                "category": category,
+                "progress %": round(100 * self.category_done[category] / applicable, 1) if applicable else 0.0,
+                **{f"Tier {tier}": self.category_tier_counts[category][tier] for tier in (0, *TIERS)},
+            })
+        top = heapq.nlargest(TOP_OUTSTANDING, range(len(index.tasks)), key=self.outstanding.__getitem__)
+        outstanding = [
+            {
+                "task": index.tasks[pos].task,
+                "category": index.tasks[pos].category,
+                "tier": index.tasks[pos].tier,
+                "organizations": self.outstanding[pos],
+            }
+            for pos in top
+            if self.outstanding[pos]
+        ]
+        return {
+            "organizations": organizations,
+            "tier_counts": {tier: self.tier_counts[tier] for tier in (0, *TIERS)},
+            "categories": categories,
+            "outstanding": outstanding,
+        }
+
+
+@lru_cache(maxsize=MAX_LOADED_FRAMEWORKS)
+def get_portfolio(framework=DEFAULT_FRAMEWORK):
+    # One per framework per server process; the first refresh reads every organization
+    return Portfolio(get_catalog(framework), get_progress_store())
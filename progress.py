@@ -0,0 +1,59 @@
+from collections import Counter
+
+from roadmap_engine import TIERS, mask_positions
+
+
+# ------------------ Progress Tracker ------------------ #
+class ProgressTracker:
+    # Counts remaining applicable tasks per (category, tier) and per tier, so that
+    # marking a task complete is O(1) and tier status is read off the counters.
+    # Completion itself stays in the session's completed_mask; only counters live here.
+    def __init__(self, index, completed_mask, applicable_mask):
+        self.index = index
+        self.applicable_mask = applicable_mask
+        self.total = Counter()
+        self.remaining = Counter()
+
+        completed_bits = bin(completed_mask)[:1:-1].ljust(len(index.tasks), "0")
+        for pos in mask_positions(applicable_mask):
+            task = index.tasks[pos]
+            keys = ((task.category, task.tier), task.tier)
+            self.total.update(keys)
+            if completed_bits[pos] != "1":
+                self.remaining.update(keys)
+
+    def update(self, task_ids, completed_mask):
+        # completed_mask is the session's mask before these tasks were added: only the
+        # applicable ones not already in it count, each once however often it is listed
+        newly_done = self.index.ids_to_mask(task_ids) & self.applicable_mask & ~completed_mask
+        for pos in mask_positions(newly_done):
+            task = self.index.tasks[pos]
+            self.remaining[(task.category, task.tier)] -= 1
+            self.remaining[task.tier] -= 1
+
+    def _highest_tier(self, key):
+        achieved = 0
+        for tier in TIERS:
+            if not self.total[key(tier)] or self.remaining[key(tier)]:
+                break
+            achieved = tier
+        return achieved
+
+    def overall_tier(self):
+        return self._highest_tier(lambda tier: tier)
+
+    def category_tier(self, category):
+        return self._highest_tier(lambda tier: (category, tier))
+
+    def category_tiers(self):
+        return {category: self.category_tier(category) for category in self.index.categories}
+
+
+def get_progress_tracker(session_state, index):
+    # Reuse the session's tracker unless the catalog or the applicability answers changed
+    applicable_mask = index.applicable_mask(session_state["questions"])
+    tracker = session_state.get("progress_tracker")
+    if tracker is None or tracker.index is not index or tracker.applicable_mask != applicable_mask:
+        tracker = ProgressTracker(index, session_state["completed_mask"], applicable_mask)
+        session_state["progress_tracker"] = tracker
+    return tracker
@@ -0,0 +1,223 @@
+import csv
+import html
+import threading
+
+from roadmap_engine import TIERS
+
+MILESTONES_FILE = "SOC 2 to NIST Privacy Framework - Milestone Descriptions.csv"
+
+# ------------------ Full NIST Tier Definitions ------------------ #
+TIER_DEFINITIONS = {
+    1: """
+### Tier 1: Partial
+
+**Privacy Risk Management Process** – Organizational privacy risk management practices are not formalized, and risk is managed in an ad hoc and sometimes reactive manner. Prioritization of privacy activities may not be directly informed by organizational risk management priorities, privacy risk assessments, or mission or business objectives.
+
+**Integrated Privacy Risk Management Program** – There is limited awareness of privacy risk at the organizational level. The organization implements privacy risk management on an irregular, case-by-case basis due to varied experience or information gained from outside sources. The organization may not have processes that enable the sharing of information about data processing and resulting privacy risks within the organization.
+
+**Data Processing Ecosystem Relationships** – There is limited understanding of an organization’s role(s) in the larger ecosystem with respect to other entities (e.g., buyers, suppliers, service providers, business associates, partners). The organization does not have processes for identifying how privacy risks may proliferate throughout the ecosystem or for communicating privacy risks or requirements to other entities in the ecosystem.
+
+**Workforce** – Some personnel may have a limited understanding of privacy risks or privacy risk management processes, but have no specific privacy responsibilities. If available, privacy training is ad hoc and the content is not kept current with best practices.
+""",
+    2: """
+### Tier 2: Risk Informed
+
+**Privacy Risk Management Process** – Risk management practices are approved by management but may not be established as organization-wide policy. Prioritization of privacy activities is directly informed by organizational risk management priorities, privacy risk assessments, or mission or business objectives.
+
+**Integrated Privacy Risk Management Program** – There is an awareness of privacy risk at the organizational level, but an organization-wide approach to managing privacy risk has not been established. Information about data processing and resulting privacy risks is shared within the organization on an informal basis. Consideration of privacy in organizational objectives and programs may occur at some but not all levels of the organization. Privacy risk assessment occurs, but is not typically repeatable or reoccurring.
+
+**Data Processing Ecosystem Relationships** – There is some understanding of an organization’s role(s) in the larger ecosystem with respect to other entities (e.g., buyers, suppliers, service providers, business associates, partners). The organization is aware of the privacy ecosystem risks associated with the products and services it provides and uses, but does not act consistently or formally upon those risks.
+
+**Workforce** – There are personnel with specific privacy responsibilities, but they may have non-privacy responsibilities as well. Privacy training is conducted regularly for privacy personnel, although there is no consistent process for updates on best practices.
+""",
+    3: """
+### Tier 3: Repeatable
+
+**Privacy Risk Management Process** – The organization’s risk management practices are formally approved and expressed as policy. Organizational privacy practices are regularly updated based on the application of risk management processes to changes in mission or business objectives and a changing risk, policy, and technology landscape.
+
+**Integrated Privacy Risk Management Program** – There is an organization-wide approach to manage privacy risk. Risk-informed policies, processes, and procedures are defined, implemented as intended, and reviewed. Consistent methods are in place to respond effectively to changes in risk. Senior privacy and non-privacy executives communicate regularly regarding privacy risk. Senior executives ensure consideration of privacy through all lines of operation in the organization.
+
+**Data Processing Ecosystem Relationships** – The organization understands its role(s), dependencies, and dependents in the larger ecosystem and may contribute to the community’s broader understanding of risks. The organization is aware of the privacy ecosystem risks associated with the products and services it provides and uses. Additionally, it usually acts formally upon those risks, including mechanisms such as written agreements to communicate privacy requirements, governance structures, and policy implementation and monitoring.
+
+**Workforce** – Dedicated privacy personnel possess the knowledge and skills to perform their appointed roles and responsibilities. There is regular, up-to-date privacy training for all personnel.
+""",
+    4: """
+### Tier 4: Adaptive
+
+**Privacy Risk Management Process** – The organization adapts its privacy practices based on lessons learned from privacy events, and identification of new privacy risks. Through a process of continuous improvement incorporating advanced privacy technologies and practices, the organization actively adapts to a changing policy and technology landscape and responds in a timely and effective manner to evolving privacy risks.
+
+**Integrated Privacy Risk Management Program** – There is an organization-wide approach to managing privacy risk that uses risk-informed policies, processes, and procedures to address problematic data actions. The relationship between privacy risk and organizational objectives is clearly understood and considered when making decisions. Senior executives monitor privacy risk in the same context as cybersecurity risk, financial risk, and other organizational risks. The organizational budget is based on an understanding of the current and predicted risk environment and risk tolerance. Business units implement executive vision and analyze system-level risks in the context of the organizational risk tolerances. Privacy risk management is part of the organizational culture and evolves from lessons learned and continuous awareness of data processing and resulting privacy risks. The organization can quickly and efficiently account for changes to business/mission objectives in how risk is approached and communicated.
+
+**Data Processing Ecosystem Relationships** – The organization understands its role(s), dependencies, and dependents in the larger ecosystem and contributes to the community’s broader understanding of risks. The organization uses real-time or near-real-time information to understand and consistently act upon privacy ecosystem risks associated with the products and services it provides and it uses. Additionally, it communicates proactively, using formal (e.g., agreements) and informal mechanisms to develop and maintain strong ecosystem relationships.
+
+**Workforce** – The organization has specialized privacy skillsets throughout the organizational structure; personnel with diverse perspectives contribute to the management of privacy risks. There is regular, up-to-date, specialized privacy training for all personnel. Personnel at all levels understand the organizational privacy values and their role in maintaining them.
+"""
+}
+
+
+# ------------------ Report Skeleton ------------------ #
+REPORT_HEAD = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            padding: 2em;
+            color: #333;
+        }
+        h1 {
+            color: #111;
+            border-bottom: 2px solid #ccc;
+            padding-bottom: 0.3em;
+        }
+        h2 {
+            color: #222;
+            margin-top: 1.5em;
+            border-left: 4px solid #4CAF50;
+            padding-left: 0.5em;
+        }
+        h3 {
+            color: #333;
+            margin-top: 1em;
+        }
+        .tier-card {
+            background-color: #f2f2f2;
+            padding: 1em;
+            margin: 1em 0;
+            border-left: 6px solid #2196F3;
+        }
+        .category {
+            margin-top: 1.5em;
+        }
+        .category h4 {
+            margin-bottom: 0.2em;
+            color: #444;
+        }
+        .milestone {
+            margin-bottom: 0.8em;
+        }
+        img {
+            max-width: 100%;
+            height: auto;
+            margin-top: 1em;
+            border: 1px solid #ccc;
+        }
+    </style>
+</head>
+<body>
+"""
+
+REPORT_TAIL = """
+</body>
+</html>
+"""
+
+
+def load_milestone_descriptions(path=MILESTONES_FILE):
+    # {category: {tier: description}}; blank and "-" cells mean the tier has no milestone
+    milestones = {}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            milestones[row["Task Category"]] = {
+                tier: row[f"Tier {tier}"]
+                for tier in TIERS
+                if (row.get(f"Tier {tier}") or "").strip() not in ("", "-")
+            }
+    return milestones
+
+
+# ------------------ Pre-rendered Fragments ------------------ #
+class ReportTemplates:
+    # Markdown and milestone HTML are rendered once per process, on the first report
+    # (or at warm-up); a report is then just the concatenation of cached fragments
+    # picked by the user's tiers. Loading a catalog only parses the milestones.
+    def __init__(self, milestones):
+        self.milestones = milestones
+        self._prerendered = False
+        self._lock = threading.Lock()
+
+    def prerender(self):
+        with self._lock:
+            if not self._prerendered:
+                self._build_fragments()
+                self._prerendered = True
+        return self
+
+    def _build_fragments(self):
+        import markdown
+
+        milestones = self.milestones
+        self.tier_definition_html = {tier: markdown.markdown(text) for tier, text in TIER_DEFINITIONS.items()}
+
+        self.overall_section = {
+            tier: f"""
+    <h2>🎯 Overall Tier</h2>
+    <div class="tier-card">
+        <strong>Tier {tier}</strong><br/>
+       {self.tier_definition_html.get(tier, "")}
+    </div>
+"""
+            for tier in (0, *TIERS)
+        }
+        self.next_overall_section = {
+            tier: (
+                f'<div class="tier-card"><h3>Next Overall Tier: Tier {tier + 1}</h3>{self.tier_definition_html[tier + 1]}</div>'
+                if tier < TIERS[-1]
+                else "<p>🎉 You have achieved the highest overall tier!</p>"
+            )
+            for tier in (0, *TIERS)
+        }
+
+        # Category progress up to each tier, and the next-milestone card for each tier
+        self.category_progress = {}
+        self.next_milestone = {}
+        for category, descriptions in milestones.items():
+            for tier in TIERS:
+                self.category_progress[(category, tier)] = (
+                    f'<div class="category"><h3>📁 {category}</h3>'
+                    + "".join(
+                        f'<div class="milestone"><strong>Tier {i}:</strong> {descriptions[i]}</div>'
+                        for i in range(1, tier + 1) if i in descriptions
+                    )
+                    + "</div>"
+                )
+                if tier in descriptions:
+                    self.next_milestone[(category, tier)] = (
+                        f'<div class="category"><h4>{category} → Tier {tier}</h4>'
+                        f'<div class="milestone">{descriptions[tier]}</div></div>'
+                    )
+
+    def remaining_targets(self, category_tiers):
+        # Each category's next tier, where the milestone CSV describes one
+        return {
+            category: tier + 1 for category, tier in category_tiers.items()
+            if tier < TIERS[-1] and tier + 1 in self.milestones.get(category, {})
+        }
+
+    def render(self, overall_tier, category_tiers, remaining_targets, data_map_html="", as_of=""):
+        # as_of labels a report rebuilt from the progress log for a past date
+        if not self._prerendered:
+            self.prerender()
+        parts = [
+            REPORT_HEAD,
+            "\n    <h1>👤 Privacy Program Profile</h1>\n",
+            f"\n    <p><em>Progress as of {html.escape(as_of)}</em></p>\n" if as_of else "",
+            data_map_html,
+            self.overall_section.get(overall_tier, ""),
+            "\n    <h2>Category-Specific Progress</h2>\n",
+        ]
+        parts.extend(
+            self.category_progress.get((category, tier), "")
+            for category, tier in category_tiers.items() if tier > 0
+        )
+        parts.append("\n    <h2>🧭 What We Are Aiming Now</h2>\n")
+        parts.append(self.next_overall_section.get(overall_tier, ""))
+        parts.extend(self.next_milestone.get((category, tier), "") for category, tier in remaining_targets.items())
+        parts.append(REPORT_TAIL)
+        return "".join(parts)
+
+
+def load_report_templates(path=MILESTONES_FILE):
+    return ReportTemplates(load_milestone_descriptions(path))
@@ -0,0 +1,339 @@
+import hashlib
+import json
+import marshal
+import os
+import sys
+import tempfile
+from collections import defaultdict
+from itertools import product
+from types import MappingProxyType
+from typing import NamedTuple
+
+ROADMAP_FILE = "roadmap_data.json"
+TIERS = (1, 2, 3, 4)
+APPLICABILITY_FLAGS = ("third_party_collection", "third_party_disclosure")
+ROLE_FILTERS = ("Process Manager", "Operations Level", "Executive Level")
+CATALOG_FORMAT = 1
+
+
+# ------------------ Task Records ------------------ #
+class Task(NamedTuple):
+    # Immutable, dict-free record; one instance per task, shared read-only by every session
+    id: str
+    category: str
+    task: str
+    tier: int
+    role: str
+    type: str
+    third_party_collection: bool
+    third_party_disclosure: bool
+
+    @classmethod
+    def from_dict(cls, row):
+        return cls(
+            id=row["id"],
+            category=sys.intern(row["category"]),
+            task=row["task"],
+            tier=int(row["tier"]),
+            role=sys.intern(row.get("role", "")),
+            type=sys.intern(row.get("type", "")),
+            third_party_collection=bool(row.get("third_party_collection")),
+            third_party_disclosure=bool(row.get("third_party_disclosure")),
+        )
+
+
+def _freeze(groups):
+    return MappingProxyType({key: tuple(values) for key, values in groups.items()})
+
+
+if hasattr(int, "bit_count"):  # Python 3.10+: popcount without building the binary string
+    def mask_count(mask):
+        return mask.bit_count()
+else:
+    def mask_count(mask):
+        return bin(mask).count("1")
+
+
+def mask_positions(mask):
+    # Set bit positions, lowest first; str.find skips runs of zeros at C speed
+    bits = bin(mask)[:1:-1]
+    positions = []
+    pos = bits.find("1")
+    while pos != -1:
+        positions.append(pos)
+        pos = bits.find("1", pos + 1)
+    return positions
+
+
+# ------------------ Role Filter ------------------ #
+def role_matches(task_type: str, is_controller: bool):
+    task_type = task_type.lower()
+    if "controller & processor" in task_type:
+        return True
+    if is_controller and "controller" in task_type:
+        return True
+    if not is_controller and "processor" in task_type:
+        return True
+    return False
+
+
+# ------------------ Roadmap Index ------------------ #
+class RoadmapIndex:
+    # Built once per process and never mutated afterwards: every container is a
+    # tuple, frozenset or read-only mapping, so sessions can share it without copies.
+    def __init__(self, tasks):
+        self.tasks = tuple(tasks)
+        self.position = MappingProxyType({t.id: i for i, t in enumerate(self.tasks)})
+
+        by_tier = {tier: [] for tier in TIERS}
+        by_category_tier = defaultdict(list)
+        by_role = defaultdict(list)
+        by_type = defaultdict(list)
+        by_flag = {flag: set() for flag in APPLICABILITY_FLAGS}
+
+        for task in self.tasks:
+            by_tier.setdefault(task.tier, []).append(task)
+            by_category_tier[(task.category, task.tier)].append(task)
+            by_role[task.role].append(task)
+            by_type[task.type].append(task)
+            for flag in APPLICABILITY_FLAGS:
+                if getattr(task, flag):
+                    by_flag[flag].add(task.id)
+
+        self.by_id = MappingProxyType({t.id: t for t in self.tasks})
+        self.by_tier = _freeze(by_tier)
+        self.by_category_tier = _freeze(by_category_tier)
+        self.by_role = _freeze(by_role)
+        self.by_type = _freeze(by_type)
+        self.by_flag = MappingProxyType({flag: frozenset(ids) for flag, ids in by_flag.items()})
+
+        self.categories = tuple(sorted({t.category for t in self.tasks}))
+
+        # Bitsets over catalog positions, for batched tier evaluation
+        self.all_mask = (1 << len(self.tasks)) - 1
+        self.tier_masks = MappingProxyType({tier: self.tasks_to_mask(ts) for tier, ts in self.by_tier.items()})
+        self.category_tier_masks = MappingProxyType(
+            {key: self.tasks_to_mask(ts) for key, ts in self.by_category_tier.items()}
+        )
+        category_masks = dict.fromkeys(self.categories, 0)
+        for (category, _), tier_mask in self.category_tier_masks.items():
+            category_masks[category] |= tier_mask
+        self.category_masks = MappingProxyType(category_masks)
+        # Display order: by tier, then by category (in order of first appearance within the
+        # tier), then catalog position; one (tier, category) header per group on the Roadmap
+        # page, however the catalog file is sorted
+        self.display_groups = tuple(
+            (self.tier_masks[tier], tuple(
+                mask for _, mask in sorted(
+                    ((mask & -mask).bit_length(), mask)
+                    for (_, group_tier), mask in self.category_tier_masks.items() if group_tier == tier
+                )
+            ))
+            for tier in sorted(self.tier_masks)
+        )
+        self.type_masks = MappingProxyType({task_type: self.tasks_to_mask(ts) for task_type, ts in self.by_type.items()})
+        self.flag_masks = MappingProxyType({flag: self.ids_to_mask(ids) for flag, ids in self.by_flag.items()})
+        # Cumulative per category: every task at or below a tier, so onboarding ORs one mask per category
+        masks_up_to = {}
+        for category in self.categories:
+            running = masks_up_to[(category, 0)] = 0
+            for tier in TIERS:
+                running |= self.category_tier_masks.get((category, tier), 0)
+                masks_up_to[(category, tier)] = running
+        self.masks_up_to = MappingProxyType(masks_up_to)
+
+        # One applicability mask per combination of the three yes/no setup answers
+        # (third-party collection, third-party disclosure, controller), so the type
+        # substring checks never run on the request path.
+        combination_masks = {}
+        for collection, disclosure, is_controller in product((False, True), repeat=3):
+            mask = self.all_mask
+            if not collection:
+                mask &= ~self.flag_masks["third_party_collection"]
+            if not disclosure:
+                mask &= ~self.flag_masks["third_party_disclosure"]
+            for task_type, type_mask in self.type_masks.items():
+                if not role_matches(task_type, is_controller):
+                    mask &= ~type_mask
+            combination_masks[(collection, disclosure, is_controller)] = mask
+        self.combination_masks = MappingProxyType(combination_masks)
+
+        # Role filter labels match any role string containing them ("Process Manager" -> "Process Manager Level & ...")
+        self.role_masks = MappingProxyType({label: self._role_mask(label) for label in ROLE_FILTERS})
+
+    def tasks_in(self, category, tier):
+        return self.by_category_tier.get((category, tier), ())
+
+    def mask_up_to_tier(self, category, tier):
+        return self.masks_up_to.get((category, min(tier, TIERS[-1])), 0)
+
+    def _role_mask(self, role_label):
+        needle = role_label.lower()
+        return self.tasks_to_mask(t for role, tasks in self.by_role.items() if needle in role.lower() for t in tasks)
+
+    def role_mask(self, role_label):
+        mask = self.role_masks.get(role_label)
+        return self._role_mask(role_label) if mask is None else mask
+
+    def target_mask(self, targets=None):
+        # Tasks at or below each category's target tier (default: all tiers)
+        if not targets:
+            return self.all_mask
+        mask = 0
+        for (category, tier), tier_mask in self.category_tier_masks.items():
+            if tier <= targets.get(category, TIERS[-1]):
+                mask |= tier_mask
+        return mask
+
+    # ------------------ Bitsets ------------------ #
+    def ids_to_mask(self, ids):
+        buf = bytearray((len(self.tasks) + 7) // 8)
+        for task_id in ids:
+            pos = self.position.get(task_id)
+            if pos is not None:
+                buf[pos >> 3] |= 1 << (pos & 7)
+        return int.from_bytes(buf, "little")
+
+    def tasks_to_mask(self, tasks):
+        return self.ids_to_mask(t.id for t in tasks)
+
+    def mask_to_ids(self, mask):
+        return [self.tasks[pos].id for pos in mask_positions(mask)]
+
+    def mask_to_bytes(self, mask):
+        # Fixed width, one bit per catalog position: about 12 KB for 100k tasks
+        return mask.to_bytes((len(self.tasks) + 7) // 8, "little")
+
+    def mask_from_bytes(self, data):
+        return int.from_bytes(data, "little") & self.all_mask
+
+    def tasks_in_mask(self, mask, start=0, stop=None):
+        # Selected tasks in display order (see display_groups). Tiers wholly before the
+        # slice are only counted, only the groups of the tiers it spans are visited, and
+        # the walk stops once the slice is full, so any page of results stays cheap.
+        tasks = []
+        seen = 0
+        for tier_mask, group_masks in self.display_groups:
+            in_tier = mask & tier_mask
+            if not in_tier:
+                continue
+            tier_count = mask_count(in_tier)
+            if seen + tier_count <= start:
+                seen += tier_count
+                continue
+            for group_mask in group_masks:
+                selected = in_tier & group_mask
+                if not selected:
+                    continue
+                count = mask_count(selected)
+                if seen + count > start:
+                    positions = mask_positions(selected)[max(0, start - seen):None if stop is None else stop - seen]
+                    tasks.extend(self.tasks[pos] for pos in positions)
+                seen += count
+                if stop is not None and seen >= stop:
+                    return tasks
+        return tasks
+
+    def applicable_mask(self, questions=None):
+        # Bitset form of the profile's should_include(); no questions means every task applies
+        if questions is None:
+            return self.all_mask
+        key = (
+            bool(questions.get("third_party_collection")),
+            bool(questions.get("third_party_disclosure")),
+            bool(questions.get("is_controller", True)),
+        )
+        return self.combination_masks[key]
+
+    def evaluate_tiers(self, completed_mask, applicable_mask=None):
+        # A tier counts once every applicable task in it (and in each tier below) is complete.
+        # An empty tier stops the climb, as in the original per-page loops.
+        if applicable_mask is None:
+            applicable_mask = self.all_mask
+        remaining = applicable_mask & ~completed_mask
+
+        def highest_tier(masks):
+            achieved = 0
+            for tier in TIERS:
+                bucket = masks(tier) & applicable_mask
+                if not bucket or bucket & remaining:
+                    break
+                achieved = tier
+            return achieved
+
+        overall_tier = highest_tier(lambda tier: self.tier_masks.get(tier, 0))
+        category_tiers = {
+            category: highest_tier(lambda tier: self.category_tier_masks.get((category, tier), 0))
+            for category in self.categories
+        }
+        return overall_tier, category_tiers
+
+
+# ------------------ Compiled Catalog ------------------ #
+# Column-oriented marshal file next to the JSON, keyed by the JSON's content hash.
+# Loading it skips JSON parsing; a stale or unreadable file just falls back to JSON.
+# Read once at import: os.umask can only be queried by setting it, which is process-wide
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def compiled_path(path):
+    return os.path.splitext(path)[0] + ".bin"
+
+
+def write_compiled_catalog(tasks, json_sha256, path, source_sha256=None):
+    columns = {field: tuple(getattr(t, field) for t in tasks) for field in Task._fields}
+    payload = {
+        "format": CATALOG_FORMAT,
+        "json_sha256": json_sha256,
+        "source_sha256": source_sha256,
+        "columns": columns,
+    }
+    # A unique temp file per writer, so processes warming up together never share one
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        # mkstemp creates the file 0600; give it the mode open() would, so a server
+        # running as another user can still read it
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+        with os.fdopen(fd, "wb") as f:
+            marshal.dump(payload, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def read_compiled_catalog(path):
+    try:
+        # One read then marshal.loads: marshal.load on a file object is several times slower
+        with open(path, "rb") as f:
+            payload = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("format") != CATALOG_FORMAT:
+        return None
+    return payload
+
+
+def load_tasks(path=ROADMAP_FILE):
+    with open(path, "rb") as f:
+        raw = f.read()
+    json_sha256 = hashlib.sha256(raw).hexdigest()
+
+    payload = read_compiled_catalog(compiled_path(path))
+    if payload is not None and payload["json_sha256"] == json_sha256:
+        columns = payload["columns"]
+        return [Task._make(values) for values in zip(*(columns[field] for field in Task._fields))]
+
+    tasks = [Task.from_dict(row) for row in json.loads(raw)]
+    try:
+        write_compiled_catalog(tasks, json_sha256, compiled_path(path))
+    except OSError:
+        pass  # read-only deployment: keep serving from JSON
+    return tasks
+
+
+def load_roadmap_index(path=ROADMAP_FILE):
+    # Shared read-only, so one index per framework serves every session;
+    # catalogs.get_catalog() owns the caching
+    return RoadmapIndex(load_tasks(path))
@@ -0,0 +1,18 @@
+import argparse
+import sys
+
+from warmup import format_report, warm_up
+
+# Starts Streamlit in this process after warming it up, so the first request finds the
+# catalogs indexed (and, with --warm-pdf, the PDF workers running). Any further
+# arguments go to `streamlit run`, e.g. python serve.py --warm-pdf --server.port 8080
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm up, then run the Streamlit app.")
+    parser.add_argument("--warm-pdf", action="store_true", help="also preload the PDF renderer and start its workers")
+    args, streamlit_args = parser.parse_known_args()
+
+    print(format_report(warm_up(pdf=args.warm_pdf)), flush=True)
+
+    from streamlit.web import cli
+
+    sys.exit(cli.main(["run", "main.py", *streamlit_args], prog_name="streamlit"))
@@ -0,0 +1,71 @@
+from itertools import product
+from typing import NamedTuple
+
+from roadmap_engine import TIERS, mask_count
+
+# (third-party collection, third-party disclosure, controller): the keys of RoadmapIndex.combination_masks
+ANSWER_COMBINATIONS = tuple(product((True, False), repeat=3))
+
+
+def answers_of(questions):
+    # The saved answers as a combination; the form's defaults (all "Yes") before the first submit
+    questions = questions or {}
+    return (
+        bool(questions.get("third_party_collection", True)),
+        bool(questions.get("third_party_disclosure", True)),
+        bool(questions.get("is_controller", True)),
+    )
+
+
+# ------------------ Target Profiles ------------------ #
+def target_profiles(index, category_tiers, custom_targets=None):
+    # Candidate custom_targets to compare; an empty dict means every tier, as for a certification
+    profiles = {}
+    if custom_targets:
+        profiles["Your targets"] = dict(custom_targets)
+    profiles["Certification (Tier 4 everywhere)"] = {}
+    for tier in TIERS[:-1]:
+        profiles[f"Tier {tier} everywhere"] = dict.fromkeys(index.categories, tier)
+    profiles["Next tier everywhere"] = {
+        category: min(category_tiers.get(category, 0) + 1, TIERS[-1]) for category in index.categories
+    }
+    return profiles
+
+
+# ------------------ Batched Simulation ------------------ #
+class Outcome(NamedTuple):
+    answers: tuple
+    profile: str
+    applicable: int  # tasks that apply under these answers
+    remaining: int  # of those, still to do to reach the profile's targets
+    remaining_by_tier: dict
+    overall_tier: int  # under these answers, as things stand
+    overall_at_target: int  # once the remaining tasks are done
+    categories_at_target: int  # categories that would then reach their target tier
+
+
+def simulate(index, completed_mask, answers, profiles):
+    # Every (answers, profile) scenario in one batch: applicability comes from the eight
+    # precomputed combination masks and each profile's target mask is built once, so a
+    # scenario costs a few mask operations plus two tier evaluations, with no rerun per change.
+    target_masks = {name: index.target_mask(targets) for name, targets in profiles.items()}
+    outcomes = []
+    for combination in answers:
+        applicable = index.combination_masks[combination]
+        outstanding = applicable & ~completed_mask
+        overall_tier, _ = index.evaluate_tiers(completed_mask, applicable)
+        for name, targets in profiles.items():
+            todo = outstanding & target_masks[name]
+            overall_at_target, category_tiers = index.evaluate_tiers(completed_mask | todo, applicable)
+            outcomes.append(Outcome(
+                combination,
+                name,
+                mask_count(applicable),
+                mask_count(todo),
+                {tier: mask_count(todo & index.tier_masks.get(tier, 0)) for tier in TIERS},
+                overall_tier,
+                overall_at_target,
+                sum(tier >= min(targets.get(category, TIERS[-1]), TIERS[-1])
+                    for category, tier in category_tiers.items()),
+            ))
+    return outcomes
@@ -0,0 +1,272 @@
+import json
+import queue
+import sqlite3
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+
+DB_FILE = "privacy_progress.db"
+POOL_SIZE = 4
+LOAD_BATCH = 500  # organizations per bulk read
+# A compacted snapshot of an organization's completed tasks is kept every this many events,
+# so rebuilding any past state replays at most this many events
+SNAPSHOT_EVERY = 50
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS organizations (
+    org_id       TEXT PRIMARY KEY,
+    framework    TEXT,
+    questions    TEXT,
+    overall_tier INTEGER,
+    updated_at   REAL NOT NULL
+);
+-- Clustered on (org_id, task_id): restoring an organization is one index range scan
+CREATE TABLE IF NOT EXISTS completed_tasks (
+    org_id       TEXT NOT NULL,
+    task_id      TEXT NOT NULL,
+    completed_at REAL NOT NULL,
+    PRIMARY KEY (org_id, task_id)
+) WITHOUT ROWID;
+-- The portfolio dashboard reads only the organizations changed since its last refresh
+CREATE INDEX IF NOT EXISTS organizations_updated_at ON organizations (updated_at);
+-- Append-only history of progress changes: rows are only ever inserted.
+-- kind: 'complete' (tasks ticked), 'replace' (onboarding), 'reset' (framework switch),
+-- or 'baseline' (progress saved before the log existed)
+CREATE TABLE IF NOT EXISTS progress_events (
+    org_id          TEXT NOT NULL,
+    seq             INTEGER NOT NULL,
+    at              REAL NOT NULL,
+    framework       TEXT,
+    kind            TEXT NOT NULL,
+    task_ids        TEXT NOT NULL,
+    role            TEXT,
+    completed_count INTEGER NOT NULL,
+    PRIMARY KEY (org_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS progress_snapshots (
+    org_id    TEXT NOT NULL,
+    seq       INTEGER NOT NULL,
+    at        REAL NOT NULL,
+    framework TEXT,
+    task_ids  TEXT NOT NULL,
+    PRIMARY KEY (org_id, seq)
+) WITHOUT ROWID;
+"""
+
+
+def replay(completed, kind, task_ids):
+    # Applies one progress event to a set of completed task ids
+    if kind == "complete":
+        completed.update(task_ids)
+    else:
+        completed.clear()
+        completed.update(task_ids)
+
+
+# ------------------ Connection Pool ------------------ #
+class ConnectionPool:
+    # A fixed set of connections shared by all sessions; WAL lets readers run
+    # alongside the single writer instead of blocking on it.
+    def __init__(self, path=DB_FILE, size=POOL_SIZE):
+        self._connections = queue.Queue()
+        for _ in range(size):
+            conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._connections.put(conn)
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+            # Databases created before frameworks were selectable lack the column
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(organizations)")}
+            if "framework" not in columns:
+                conn.execute("ALTER TABLE organizations ADD COLUMN framework TEXT")
+
+    @contextmanager
+    def connection(self):
+        conn = self._connections.get()
+        try:
+            with conn:  # one transaction: commit on success, roll back on error
+                yield conn
+        finally:
+            self._connections.put(conn)
+
+
+# ------------------ Progress Store ------------------ #
+class ProgressStore:
+    def __init__(self, pool):
+        self.pool = pool
+
+    def load(self, org_id):
+        # (framework, questions, completed_ids) for an organization, or None if it has never been saved
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT framework, questions FROM organizations WHERE org_id = ?", (org_id,)).fetchone()
+            if row is None:
+                return None
+            completed = [r[0] for r in conn.execute("SELECT task_id FROM completed_tasks WHERE org_id = ?", (org_id,))]
+        return row[0], (json.loads(row[1]) if row[1] else None), completed
+
+    def saved_since(self, timestamp):
+        # (org_id, updated_at) for every organization saved at or after the timestamp
+        with self.pool.connection() as conn:
+            return conn.execute(
+                "SELECT org_id, updated_at FROM organizations WHERE updated_at >= ?", (timestamp,)
+            ).fetchall()
+
+    def load_many(self, org_ids):
+        # (org_id, framework, questions, updated_at, completed_ids) per organization, in batches
+        # that stay under SQLite's bound-parameter limit
+        org_ids = list(org_ids)
+        results = []
+        with self.pool.connection() as conn:
+            for start in range(0, len(org_ids), LOAD_BATCH):
+                batch = org_ids[start:start + LOAD_BATCH]
+                rows = conn.execute(
+                    "SELECT org_id, framework, questions, updated_at, "
+                    "(SELECT group_concat(task_id, char(31)) FROM completed_tasks c WHERE c.org_id = o.org_id) "
+                    f"FROM organizations o WHERE org_id IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                results.extend(
+                    (org_id, framework, json.loads(questions) if questions else None, updated_at,
+                     completed.split("\x1f") if completed else [])
+                    for org_id, framework, questions, updated_at, completed in rows
+                )
+        return results
+
+    def _touch(self, conn, org_id):
+        conn.execute(
+            "INSERT INTO organizations (org_id, updated_at) VALUES (?, ?) "
+            "ON CONFLICT(org_id) DO UPDATE SET updated_at = excluded.updated_at",
+            (org_id, time.time()),
+        )
+
+    # ------------------ Event Log ------------------ #
+    def _completed_ids(self, conn, org_id):
+        return [r[0] for r in conn.execute("SELECT task_id FROM completed_tasks WHERE org_id = ?", (org_id,))]
+
+    def _ensure_baseline(self, conn, org_id):
+        # Progress saved before the log existed becomes its first event, so replays start from it
+        if conn.execute("SELECT 1 FROM progress_events WHERE org_id = ? LIMIT 1", (org_id,)).fetchone():
+            return
+        row = conn.execute(
+            "SELECT MAX(completed_at) FROM completed_tasks WHERE org_id = ?", (org_id,)
+        ).fetchone()
+        if row[0] is not None:
+            self._append(conn, org_id, "baseline", self._completed_ids(conn, org_id), at=row[0])
+
+    def _append(self, conn, org_id, kind, task_ids, role=None, at=None):
+        # Same transaction as the state change it records (the _touch before it holds the write lock)
+        at = time.time() if at is None else at
+        seq = conn.execute(
+            "SELECT COALESCE(MAX(seq), 0) + 1 FROM progress_events WHERE org_id = ?", (org_id,)
+        ).fetchone()[0]
+        framework = conn.execute("SELECT framework FROM organizations WHERE org_id = ?", (org_id,)).fetchone()[0]
+        count = conn.execute("SELECT COUNT(*) FROM completed_tasks WHERE org_id = ?", (org_id,)).fetchone()[0]
+        conn.execute(
+            "INSERT INTO progress_events (org_id, seq, at, framework, kind, task_ids, role, completed_count) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (org_id, seq, at, framework, kind, json.dumps(list(task_ids)), role, count),
+        )
+        if seq % SNAPSHOT_EVERY == 0:
+            conn.execute(
+                "INSERT INTO progress_snapshots (org_id, seq, at, framework, task_ids) VALUES (?, ?, ?, ?, ?)",
+                (org_id, seq, at, framework, json.dumps(self._completed_ids(conn, org_id))),
+            )
+
+    def history(self, org_id):
+        # (timestamp, completed task count) after every event, for progress charts; no replay needed
+        with self.pool.connection() as conn:
+            return conn.execute(
+                "SELECT at, completed_count FROM progress_events WHERE org_id = ? ORDER BY seq", (org_id,)
+            ).fetchall()
+
+    def events(self, org_id):
+        # The full audit trail: (seq, timestamp, framework, kind, task_ids, role)
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT seq, at, framework, kind, task_ids, role FROM progress_events WHERE org_id = ? ORDER BY seq",
+                (org_id,),
+            ).fetchall()
+        return [(seq, at, framework, kind, json.loads(task_ids), role) for seq, at, framework, kind, task_ids, role in rows]
+
+    def as_of(self, org_id, timestamp):
+        # (framework, completed_ids) as they stood at the timestamp, or None before the first event.
+        # Snapshots land on every SNAPSHOT_EVERY-th event, so after the nearest one at or before the
+        # timestamp at most SNAPSHOT_EVERY events remain to replay.
+        with self.pool.connection() as conn:
+            snapshot = conn.execute(
+                "SELECT seq, framework, task_ids FROM progress_snapshots WHERE org_id = ? AND at <= ? "
+                "ORDER BY seq DESC LIMIT 1",
+                (org_id, timestamp),
+            ).fetchone()
+            start, framework, completed = 0, None, set()
+            if snapshot:
+                start, framework, completed = snapshot[0], snapshot[1], set(json.loads(snapshot[2]))
+            events = conn.execute(
+                "SELECT framework, kind, task_ids FROM progress_events "
+                "WHERE org_id = ? AND seq > ? AND seq <= ? AND at <= ? ORDER BY seq",
+                (org_id, start, start + SNAPSHOT_EVERY, timestamp),
+            ).fetchall()
+        if snapshot is None and not events:
+            return None
+        for framework, kind, task_ids in events:
+            replay(completed, kind, json.loads(task_ids))
+        return framework, sorted(completed)
+
+    # ------------------ Writes ------------------ #
+    def save_framework(self, org_id, framework):
+        # Task ids are per catalog, so switching frameworks starts the progress over
+        with self.pool.connection() as conn:
+            self._touch(conn, org_id)
+            previous = conn.execute("SELECT framework FROM organizations WHERE org_id = ?", (org_id,)).fetchone()[0]
+            changed = conn.execute(
+                "UPDATE organizations SET framework = ?, questions = NULL, overall_tier = NULL "
+                "WHERE org_id = ? AND framework IS NOT ?",
+                (framework, org_id, framework),
+            ).rowcount
+            if changed:
+                if previous is not None:
+                    self._ensure_baseline(conn, org_id)
+                conn.execute("DELETE FROM completed_tasks WHERE org_id = ?", (org_id,))
+                if previous is not None:
+                    self._append(conn, org_id, "reset", ())
+
+    def save_questions(self, org_id, questions, overall_tier=None):
+        with self.pool.connection() as conn:
+            self._touch(conn, org_id)
+            conn.execute(
+                "UPDATE organizations SET questions = ?, overall_tier = COALESCE(?, overall_tier) WHERE org_id = ?",
+                (json.dumps(questions), overall_tier, org_id),
+            )
+
+    def add_completed(self, org_id, task_ids, role=None):
+        # One transaction per batch, however many tasks were ticked; role is the one the
+        # person saving declared on the roadmap, if any
+        task_ids = list(task_ids)
+        now = time.time()
+        with self.pool.connection() as conn:
+            self._touch(conn, org_id)
+            self._ensure_baseline(conn, org_id)
+            conn.executemany(
+                "INSERT OR IGNORE INTO completed_tasks (org_id, task_id, completed_at) VALUES (?, ?, ?)",
+                [(org_id, task_id, now) for task_id in task_ids],
+            )
+            self._append(conn, org_id, "complete", task_ids, role, now)
+
+    def replace_completed(self, org_id, task_ids):
+        # Onboarding redefines the whole starting point
+        task_ids = list(task_ids)
+        now = time.time()
+        with self.pool.connection() as conn:
+            self._touch(conn, org_id)
+            conn.execute("DELETE FROM completed_tasks WHERE org_id = ?", (org_id,))
+            conn.executemany(
+                "INSERT INTO completed_tasks (org_id, task_id, completed_at) VALUES (?, ?, ?)",
+                [(org_id, task_id, now) for task_id in task_ids],
+            )
+            self._append(conn, org_id, "replace", task_ids, at=now)
+
+
+@lru_cache(maxsize=None)
+def get_progress_store(path=DB_FILE):
+    return ProgressStore(ConnectionPool(path))
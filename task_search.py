@@ -0,0 +1,101 @@
+import heapq
+import math
+import re
+from bisect import bisect_left
+from types import MappingProxyType
+
+from roadmap_engine import mask_positions
+
+# A match in the category or role says more about a task than the same word in its text
+FIELD_WEIGHTS = {"task": 1.0, "category": 2.0, "role": 1.5, "type": 1.5}
+# Words a query prefix may expand to (e.g. "vend" -> vendor, vendors, ...)
+MAX_PREFIX_EXPANSIONS = 50
+# Terms found in at least 1/DENSE_FRACTION of the tasks are kept as bitmaps
+DENSE_FRACTION = 64
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the their this to with".split()
+)
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return [token for token in _TOKEN.findall(text.lower()) if len(token) > 1 and token not in STOPWORDS]
+
+
+# ------------------ Inverted Index ------------------ #
+class TaskSearch:
+    # Built once per catalog: term -> {catalog position: field-weighted frequency}.
+    # Matching works on bitmaps, so a query combines with the roadmap's applicability,
+    # target, role and completion masks by plain & and |; scores are only computed for
+    # the tasks that survive every filter, and only the requested page is sorted.
+    def __init__(self, index):
+        self.index = index
+        postings = {}
+        for pos, task in enumerate(index.tasks):
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(getattr(task, field)):
+                    entry = postings.setdefault(token, {})
+                    entry[pos] = entry.get(pos, 0.0) + weight
+        self.postings = MappingProxyType(postings)
+        self.vocabulary = tuple(sorted(postings))
+        count = max(1, len(index.tasks))
+        self.idf = MappingProxyType({term: math.log(1 + count / len(p)) for term, p in postings.items()})
+        # Frequent terms keep a ready bitmap; a rare term's bitmap is cheaper to build per query
+        # than to hold (a full-width bitmap costs as much as DENSE_FRACTION of the catalog's positions)
+        dense = max(1, count // DENSE_FRACTION)
+        self.term_masks = MappingProxyType(
+            {term: self.positions_to_mask(p) for term, p in postings.items() if len(p) >= dense}
+        )
+
+    def term_mask(self, term):
+        mask = self.term_masks.get(term)
+        return self.positions_to_mask(self.postings[term]) if mask is None else mask
+
+    def expand(self, term):
+        # The term itself plus every vocabulary word it is a prefix of ("vend" -> vendor, vendors)
+        start = bisect_left(self.vocabulary, term)
+        words = []
+        for word in self.vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not word.startswith(term):
+                break
+            words.append(word)
+        return tuple(words)
+
+    def search(self, query):
+        # (match mask, expanded query terms); every query word must match. None for an empty query.
+        terms = tokenize(query)
+        if not terms:
+            return None
+        expanded = tuple(self.expand(term) for term in dict.fromkeys(terms))
+        mask = self.index.all_mask
+        for words in expanded:
+            term_mask = 0
+            for word in words:
+                term_mask |= self.term_mask(word)
+            mask &= term_mask
+            if not mask:
+                break
+        return mask, expanded
+
+    def score(self, pos, expanded):
+        # Sum over query words of the best-weighted word each one expands to
+        total = 0.0
+        for words in expanded:
+            total += max(self.postings[word].get(pos, 0.0) * self.idf[word] for word in words)
+        return total
+
+    def ranked(self, mask, expanded, start=0, stop=None):
+        # Tasks in the mask, best score first (ties in display order)
+        tasks = self.index.tasks
+        keyed = [(-self.score(pos, expanded), tasks[pos].tier, pos) for pos in mask_positions(mask)]
+        if stop is None:
+            keyed.sort()
+        else:
+            keyed = heapq.nsmallest(stop, keyed)
+        return [tasks[pos] for _, _, pos in keyed[start:stop]]
+
+    def positions_to_mask(self, positions):
+        buf = bytearray((len(self.index.tasks) + 7) // 8)
+        for pos in positions:
+            buf[pos >> 3] |= 1 << (pos & 7)
+        return int.from_bytes(buf, "little")
@@ -0,0 +1,71 @@
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+
+from catalogs import MAX_LOADED_FRAMEWORKS, available_frameworks, get_catalog
+from storage import DB_FILE
+
+# Heavy third-party imports, in the order a first visit would hit them
+IMPORTS = ("streamlit", "markdown", "PIL.Image")
+PDF_IMPORTS = ("xhtml2pdf.pisa",)
+
+# Filled in by warm_up(); the admin panel shows it
+STARTUP_REPORT = []
+
+
+# ------------------ Warm-up ------------------ #
+def _timed(step, fn):
+    start = time.perf_counter()
+    result = fn()
+    STARTUP_REPORT.append((step, (time.perf_counter() - start) * 1000))
+    return result
+
+
+def warm_up(frameworks=None, pdf=False):
+    # Pays the one-off costs before the first visitor does: imports, catalog load and
+    # index build, report fragments, the portfolio's first full read of saved
+    # organizations, and (optionally) the PDF renderer and worker pool
+    STARTUP_REPORT.clear()
+    for module in IMPORTS + (PDF_IMPORTS if pdf else ()):
+        if module in sys.modules:
+            STARTUP_REPORT.append((f"import {module} (already loaded)", 0.0))
+        else:
+            _timed(f"import {module}", lambda: importlib.import_module(module))
+
+    for name in frameworks or available_frameworks()[:MAX_LOADED_FRAMEWORKS]:
+        catalog = _timed(f"load and index {name}", lambda: get_catalog(name))
+        _timed(f"render {name} report fragments", catalog.templates.prerender)
+        if os.path.exists(DB_FILE):
+            from portfolio import get_portfolio
+
+            _timed(f"aggregate {name} portfolio", get_portfolio(name).refresh)
+
+    if pdf:
+        from pdf_export import get_pdf_jobs
+
+        _timed("start PDF workers", get_pdf_jobs().warm_up)
+    return STARTUP_REPORT
+
+
+def format_report(report):
+    width = max(len(step) for step, _ in report)
+    lines = [f"{step:<{width}}  {ms:>9.1f} ms" for step, ms in report]
+    lines.append(f"{'total':<{width}}  {sum(ms for _, ms in report):>9.1f} ms")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure cold-start costs: imports, catalog loading and indexing.")
+    parser.add_argument("--framework", action="append", help="framework to load (default: every available one)")
+    parser.add_argument("--pdf", action="store_true", help="include the PDF renderer and worker pool")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = warm_up(args.framework, args.pdf)
+    if args.json:
+        print(json.dumps([{"step": step, "ms": round(ms, 2)} for step, ms in report], indent=2))
+    else:
+        print(format_report(report))